@@ -1,42 +1,108 @@
 """The wundergroundpws component."""
 
+import asyncio
+from collections import OrderedDict
+from datetime import timedelta
 import logging
 from pathlib import Path
-from typing import Final
+from typing import Any, Final
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import json as json_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
+from .api import async_get_api_client
 from .const import (
     API_IMPERIAL,
     API_METRIC,
     API_URL_IMPERIAL,
     API_URL_METRIC,
+    CONF_ADAPTIVE_POLLING,
     CONF_CALENDARDAYTEMPERATURE,
+    CONF_FORECAST_INTERVAL,
     CONF_FORECAST_SENSORS,
     CONF_LANG,
+    CONF_LOCAL_PUSH,
+    CONF_MAX_STALENESS,
     CONF_NUMERIC_PRECISION,
+    CONF_PUSH_FORWARD,
+    CONF_PUSH_PASSWORD,
     CONF_PWS_ID,
+    DATA_TRANSLATIONS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_FORECAST_INTERVAL,
+    DEFAULT_LOCAL_PUSH,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_PUSH_FORWARD,
+    DEFAULT_PUSH_PASSWORD,
     DOMAIN,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    TRANSLATION_CACHE_SIZE,
 )
 from .coordinator import (
     WundergroundPWSUpdateCoordinator,
     WundergroundPWSUpdateCoordinatorConfig,
 )
+from .profiler import async_register_services
 
 PLATFORMS: Final = [Platform.SENSOR, Platform.WEATHER]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 _LOGGER = logging.getLogger(__name__)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the WundergroundPWS services."""
+    async_register_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up the WundergroundPWS component."""
     hass.data.setdefault(DOMAIN, {})
 
+    config = await _async_build_config(hass, entry)
+    # continue the API key counters of the previous run
+    await async_get_api_client(hass).async_load_budgets()
+
+    wupwscoordinator = WundergroundPWSUpdateCoordinator(hass, config, entry)
+    # start from the data saved by the previous run and refresh in the background,
+    # spread over the poll interval
+    restored = await wupwscoordinator.async_restore()
+    if not restored:
+        await wupwscoordinator.async_config_entry_first_refresh()
+        if not wupwscoordinator.last_update_success:
+            raise ConfigEntryNotReady
+
+    wupwscoordinator.async_set_local_push(config.local_push)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    hass.data[DOMAIN][entry.entry_id] = wupwscoordinator
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            wupwscoordinator.async_staggered_refresh(),
+            f"{DOMAIN} {entry.title} refresh",
+        )
+
+    return True
+
+
+async def _async_build_config(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> WundergroundPWSUpdateCoordinatorConfig:
+    """Build the coordinator configuration from the config entry."""
     latitude = entry.options[CONF_LATITUDE]
     longitude = entry.options[CONF_LONGITUDE]
 
@@ -58,51 +124,94 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         latitude=latitude,
         longitude=longitude,
         forecast_enable=entry.options.get(CONF_FORECAST_SENSORS, False),
+        forecast_interval=timedelta(
+            minutes=entry.options.get(CONF_FORECAST_INTERVAL, DEFAULT_FORECAST_INTERVAL)
+        ),
+        max_staleness=timedelta(
+            minutes=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+        ),
+        adaptive_polling=entry.options.get(
+            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+        ),
+        local_push=entry.options.get(CONF_LOCAL_PUSH, DEFAULT_LOCAL_PUSH),
+        push_forward=entry.options.get(CONF_PUSH_FORWARD, DEFAULT_PUSH_FORWARD),
+        push_password=entry.options.get(CONF_PUSH_PASSWORD, DEFAULT_PUSH_PASSWORD),
         tranfile="",
     )
 
     # get translation file for wupws sensor friendly_name
-    tfiledir = Path(
-        f"{hass.config.config_dir}/custom_components/{DOMAIN}/wupws_translations/"
-    )
-    tfilename = config.lang.split("-", 1)[0]
+    config.tranfile = await _async_get_tranfile(hass, config.lang)
 
-    translation_file = tfiledir / f"{tfilename}.json"
-    if translation_file.is_file():
-        config.tranfile = await hass.async_add_executor_job(
-            json_util.load_json, str(translation_file)
-        )
-    else:
-        config.tranfile = await hass.async_add_executor_job(
-            json_util.load_json, str(tfiledir / "en.json")
-        )
-        _LOGGER.warning(
-            "Sensor translation file %s.json does not exist. Defaulting to en-US",
-            tfilename,
-        )
+    return config
 
-    wupwscoordinator = WundergroundPWSUpdateCoordinator(hass, config)
-    await wupwscoordinator.async_config_entry_first_refresh()
-    if not wupwscoordinator.last_update_success:
-        raise ConfigEntryNotReady
 
-    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
-    hass.data[DOMAIN][entry.entry_id] = wupwscoordinator
+async def _async_get_tranfile(hass: HomeAssistant, lang: str) -> dict[str, Any]:
+    """Return the sensor translation table of a language.
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    Tables are loaded once and shared by all entries, the least recently used
+    languages are dropped from the cache.
+    """
+    tfilename = lang.split("-", 1)[0]
+    cache: OrderedDict[str, asyncio.Future[dict[str, Any]]] = hass.data.setdefault(
+        DATA_TRANSLATIONS, OrderedDict()
+    )
+    if (future := cache.get(tfilename)) is None:
+        # entries set up together wait for the same load
+        future = cache[tfilename] = hass.async_add_executor_job(
+            _load_tranfile, hass.config.config_dir, tfilename
+        )
+        while len(cache) > TRANSLATION_CACHE_SIZE:
+            cache.popitem(last=False)
+    cache.move_to_end(tfilename)
+    try:
+        return await future
+    except Exception:
+        cache.pop(tfilename, None)
+        raise
 
-    return True
+
+def _load_tranfile(config_dir: str, tfilename: str) -> dict[str, Any]:
+    """Load the sensor translation file of a language, defaulting to English."""
+    tfiledir = Path(f"{config_dir}/custom_components/{DOMAIN}/wupws_translations/")
+
+    translation_file = tfiledir / f"{tfilename}.json"
+    if translation_file.is_file():
+        return json_util.load_json(str(translation_file))
+    _LOGGER.warning(
+        "Sensor translation file %s.json does not exist. Defaulting to en-US",
+        tfilename,
+    )
+    return json_util.load_json(str(tfiledir / "en.json"))
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        wupwscoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await wupwscoordinator.async_shutdown()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data saved for a removed config entry."""
+    await Store(
+        hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id)
+    ).async_remove()
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update listener."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Update listener.
+
+    Options are applied to the running coordinator, the entry is only
+    reloaded when the forecast sensors are added or removed.
+    """
+    wupwscoordinator: WundergroundPWSUpdateCoordinator = hass.data[DOMAIN][
+        entry.entry_id
+    ]
+    config = await _async_build_config(hass, entry)
+    if config.forecast_enable != wupwscoordinator.forecast_enable:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    await wupwscoordinator.async_apply_config(config)
@@ -0,0 +1,740 @@
+"""The WundergroundPWS API client shared by all config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from asyncio import timeout
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+import hashlib
+from http import HTTPStatus
+import logging
+import random
+import time
+from types import SimpleNamespace
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp import hdrs
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+from homeassistant.util.ssl import client_context
+
+from .const import (
+    API_CACHE_SIZE,
+    API_KEY_BURST,
+    API_KEY_CALLS_PER_DAY,
+    API_KEY_CALLS_PER_MINUTE,
+    API_KEY_DAILY_RESERVE,
+    BREAKER_FAILURES,
+    BREAKER_RESET,
+    CONNECT_TIMEOUT,
+    CONNECTION_LIMIT,
+    DATA_API_CLIENT,
+    DEFAULT_TIMEOUT,
+    DNS_CACHE_TTL,
+    JSON_EXECUTOR_THRESHOLD,
+    KEEPALIVE_TIMEOUT,
+    POLL_STAGGER_JITTER,
+    PUSH_FORWARD_URL,
+    RATE_LIMIT_BACKOFF,
+    READ_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF,
+    RETRY_BACKOFF_MAX,
+    STORAGE_KEY_BUDGETS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .model import WundergroundPWSForecast, WundergroundPWSHourlyForecast
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+
+# Fractional part of the golden ratio, spreads any number of poll slots evenly
+_GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+
+HEADERS = {
+    "Accept-Encoding": "gzip",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36",
+}
+
+
+@callback
+def async_get_api_client(hass: HomeAssistant) -> WundergroundPWSApiClient:
+    """Return the API client shared by all config entries."""
+    if DATA_API_CLIENT not in hass.data:
+        hass.data[DATA_API_CLIENT] = WundergroundPWSApiClient(hass)
+    return hass.data[DATA_API_CLIENT]
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    """A decoded response with its HTTP cache validators."""
+
+    result: Any
+    fetched: float
+    fresh_until: float
+    etag: str | None
+    last_modified: str | None
+    # size and decode time of the downloaded payload
+    stats: dict[str, float]
+
+    @classmethod
+    def from_response(
+        cls, result: Any, headers: Mapping[str, str], stats: dict[str, float]
+    ) -> _CachedResponse:
+        """Cache a decoded response under the validators it was sent with."""
+        now = time.time()
+        return cls(
+            result,
+            now,
+            now + _max_age(headers),
+            headers.get(hdrs.ETAG),
+            headers.get(hdrs.LAST_MODIFIED),
+            stats,
+        )
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Return the headers making a request conditional."""
+        headers = {}
+        if self.etag is not None:
+            headers[hdrs.IF_NONE_MATCH] = self.etag
+        if self.last_modified is not None:
+            headers[hdrs.IF_MODIFIED_SINCE] = self.last_modified
+        return headers
+
+    def revalidated(self, headers: Mapping[str, str]) -> None:
+        """Refresh the entry after a 304 Not Modified response."""
+        self.fetched = time.time()
+        self.fresh_until = self.fetched + _max_age(headers)
+        self.etag = headers.get(hdrs.ETAG, self.etag)
+        self.last_modified = headers.get(hdrs.LAST_MODIFIED, self.last_modified)
+
+
+def _max_age(headers: Mapping[str, str]) -> float:
+    """Return for how many more seconds a response is fresh."""
+    max_age = 0.0
+    for directive in headers.get(hdrs.CACHE_CONTROL, "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name in ("no-cache", "no-store"):
+            return 0.0
+        if name == "max-age":
+            try:
+                max_age = float(value.strip('"'))
+            except ValueError:
+                return 0.0
+    try:
+        age = float(headers.get(hdrs.AGE, 0))
+    except ValueError:
+        age = 0.0
+    return max(max_age - age, 0.0)
+
+
+def _retry_after(headers: Mapping[str, str]) -> float:
+    """Return the seconds to wait given by a Retry-After header."""
+    if (value := headers.get(hdrs.RETRY_AFTER)) is None:
+        return RATE_LIMIT_BACKOFF
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(
+            (parsedate_to_datetime(value) - dt_util.utcnow()).total_seconds(), 0.0
+        )
+    except (TypeError, ValueError):
+        return RATE_LIMIT_BACKOFF
+
+
+class InvalidApiKey(HomeAssistantError):
+    """Error to indicate there is an invalid api key."""
+
+
+class InvalidStationId(HomeAssistantError):
+    """Error to indicate there is an invalid api key."""
+
+
+class StationOffline(HomeAssistantError):
+    """Error to indicate the station has no current observation (HTTP 204)."""
+
+
+def _request_trace_config() -> aiohttp.TraceConfig:
+    """Return a trace config recording when each phase of a request ended.
+
+    Milliseconds since the request started are written to the dict passed
+    as trace_request_ctx: dns, connect (both missing when a pooled connection
+    or cached address was reused) and ttfb, when the response headers
+    arrived.
+    """
+    trace_config = aiohttp.TraceConfig()
+
+    async def _on_request_start(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        context.start = time.perf_counter()
+
+    def _record(phase: str) -> Callable[..., Any]:
+        async def _on_phase_end(
+            session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+        ) -> None:
+            if isinstance(timings := context.trace_request_ctx, dict):
+                timings[phase] = round((time.perf_counter() - context.start) * 1000, 1)
+
+        return _on_phase_end
+
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_dns_resolvehost_end.append(_record("dns"))
+    trace_config.on_connection_create_end.append(_record("connect"))
+    trace_config.on_request_end.append(_record("ttfb"))
+    return trace_config
+
+
+class RequestDeferred(Exception):
+    """Raised when the API key budget does not allow a request right now."""
+
+
+class CircuitOpen(RequestDeferred):
+    """Raised when requests to a host are suspended after repeated failures."""
+
+
+def _key_id(api_key: str) -> str:
+    """Return the name the counters of an API key are saved under."""
+    # not the key itself, it is only kept in the config entry
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _redact(text: str, secret: str) -> str:
+    """Remove a secret, e.g. the API key in a URL, from an error message."""
+    return text.replace(secret, "**REDACTED**") if secret else text
+
+
+class CircuitBreaker:
+    """Suspend requests to a host that keeps failing.
+
+    The breaker opens after BREAKER_FAILURES consecutive failures. Once
+    BREAKER_RESET seconds have passed, a single probe request is let through
+    (half-open): it closes the breaker when it succeeds and opens it again
+    when it fails.
+    """
+
+    def __init__(self, host: str) -> None:
+        """Initialize."""
+        self._host = host
+        self._opened: float | None = None
+        self._half_open = False
+        self.failures = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Return if requests to the host are suspended."""
+        return self._opened is not None
+
+    def before_request(self) -> None:
+        """Raise CircuitOpen unless a request may be sent now."""
+        if self._opened is None:
+            return
+        now = time.monotonic()
+        if now < self._opened + BREAKER_RESET:
+            raise CircuitOpen(
+                f"Requests to {self._host} suspended after {self.failures} failures"
+            )
+        # re-arm the timer, so only this probe is sent until it completes
+        self._opened = now
+        self._half_open = True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        if self._opened is not None:
+            _LOGGER.info("Requests to %s resumed", self._host)
+        self._opened = None
+        self._half_open = False
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker when needed."""
+        self.failures += 1
+        if self._half_open or (
+            self._opened is None and self.failures >= BREAKER_FAILURES
+        ):
+            if not self._half_open:
+                _LOGGER.warning(
+                    "Suspending requests to %s for %s seconds after %s failures",
+                    self._host,
+                    BREAKER_RESET,
+                    self.failures,
+                )
+            self._opened = time.monotonic()
+            self._half_open = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the breaker for the diagnostics."""
+        return {
+            "open": self.is_open,
+            "half_open": self._half_open,
+            "failures": self.failures,
+        }
+
+
+class ApiKeyBudget:
+    """Token bucket shared by every config entry using the same API key.
+
+    Tokens refill at the per-minute limit of the key, so requests are spaced
+    out once a short burst is used up. Low priority requests are deferred
+    instead of waiting for a token, and once the daily quota runs low only
+    high priority requests are sent.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._rate = API_KEY_CALLS_PER_MINUTE / 60
+        self._tokens = float(API_KEY_BURST)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._day = dt_util.utcnow().date()
+        self._paused_until = 0.0
+        self.calls_today = 0
+        self.deferred_today = 0
+        self.consumers = 0
+
+    @callback
+    def register(self) -> CALLBACK_TYPE:
+        """Register an entry polling with this API key."""
+        self.consumers += 1
+        registered = True
+
+        @callback
+        def _unregister() -> None:
+            nonlocal registered
+            if registered:
+                registered = False
+                self.consumers -= 1
+
+        return _unregister
+
+    @property
+    def min_poll_interval(self) -> float:
+        """Return the shortest poll interval, in seconds, that fits the quota.
+
+        The daily quota, less the forecast reserve, is split evenly over the
+        entries polling with this API key.
+        """
+        return (
+            86400
+            * max(self.consumers, 1)
+            / (API_KEY_CALLS_PER_DAY * (1 - API_KEY_DAILY_RESERVE))
+        )
+
+    @property
+    def remaining_today(self) -> int:
+        """Return the calls left in today's (UTC) quota."""
+        self._refill()
+        return max(API_KEY_CALLS_PER_DAY - self.calls_today, 0)
+
+    def pause(self, seconds: float) -> None:
+        """Send no requests for a while, after the API rate limited the key."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last request."""
+        now = time.monotonic()
+        self._tokens = min(
+            float(API_KEY_BURST), self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        if (today := dt_util.utcnow().date()) != self._day:
+            self._day = today
+            self.calls_today = 0
+            self.deferred_today = 0
+
+    async def async_acquire(self, priority: int) -> None:
+        """Take a token, waiting for one unless the request is low priority."""
+        async with self._lock:
+            self._refill()
+            if (paused := self._paused_until - time.monotonic()) > 0:
+                self.deferred_today += 1
+                raise RequestDeferred(
+                    f"API key rate limited, retrying after {paused:.0f} s"
+                )
+            if self.calls_today >= API_KEY_CALLS_PER_DAY:
+                self.deferred_today += 1
+                raise RequestDeferred("Daily API key quota exhausted")
+            if priority == PRIORITY_LOW and (
+                self._tokens < 1
+                or self.remaining_today <= API_KEY_CALLS_PER_DAY * API_KEY_DAILY_RESERVE
+            ):
+                self.deferred_today += 1
+                raise RequestDeferred("API key budget is tight")
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+            self.calls_today += 1
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the quota telemetry of the API key."""
+        return {
+            "calls_today": self.calls_today,
+            "remaining_today": self.remaining_today,
+            "deferred_today": self.deferred_today,
+        }
+
+    def as_stored(self) -> dict[str, Any]:
+        """Return the daily counters, saved across restarts."""
+        self._refill()
+        return {
+            "day": self._day.isoformat(),
+            "calls_today": self.calls_today,
+            "deferred_today": self.deferred_today,
+        }
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        """Continue the daily counters saved by a previous run.
+
+        Counters saved on an earlier UTC day are ignored.
+        """
+        self._refill()
+        if stored.get("day") != self._day.isoformat():
+            return
+        self.calls_today += stored.get("calls_today", 0)
+        self.deferred_today += stored.get("deferred_today", 0)
+
+
+class WundergroundPWSApiClient:
+    """Deduplicating WU API client that sits under all coordinators.
+
+    Requests for the same URL that are in flight at the same time are sent
+    once and the result is handed to every caller. Decoded responses are
+    cached per URL with their HTTP validators: they are reused while fresh
+    per Cache-Control, and otherwise requested conditionally so an unchanged
+    payload costs neither bandwidth nor decoding. Parsed forecasts are also
+    kept until they expire, so config entries that share a (rounded) forecast
+    geocode share one forecast request.
+
+    The client owns a connection pool, separate from the general purpose one
+    of Home Assistant, that keeps connections to the API alive between polls
+    and caches DNS lookups.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ssl=client_context(),
+            ),
+            trace_configs=[_request_trace_config()],
+        )
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close)
+        # phase timings of the last request to each API path, in milliseconds
+        self.request_timings: dict[str, dict[str, float]] = {}
+        self._in_flight: dict[str, asyncio.Task[Any]] = {}
+        # least recently used first, URLs of unloaded entries or of options
+        # changed since are dropped once API_CACHE_SIZE is exceeded
+        self._cache: OrderedDict[str, _CachedResponse] = OrderedDict()
+        self._budgets: dict[str, ApiKeyBudget] = {}
+        self._budget_store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY_BUDGETS)
+        # counters saved by the previous run per API key id, None until loaded
+        self._stored_budgets: dict[str, dict[str, Any]] | None = None
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._poll_slots = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the client for the diagnostics."""
+        return {
+            "request_timings": self.request_timings,
+            "breakers": {
+                host: breaker.as_dict() for host, breaker in self._breakers.items()
+            },
+            "cached_responses": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    async def _async_close(self, event: Event) -> None:
+        """Close the connection pool when Home Assistant stops."""
+        await self.session.close()
+
+    def payload_stats(self, url: str) -> dict[str, float] | None:
+        """Return the size and decode time of the last payload of a URL."""
+        if (cached := self._cache.get(url)) is None:
+            return None
+        return cached.stats
+
+    def _cached(self, url: str) -> _CachedResponse | None:
+        """Return the cached response of a URL, marking it recently used."""
+        if (cached := self._cache.get(url)) is not None:
+            self._cache.move_to_end(url)
+        return cached
+
+    def budget(self, api_key: str) -> ApiKeyBudget:
+        """Return the request budget of an API key.
+
+        A new budget continues today's counters saved by the previous run,
+        once they are loaded.
+        """
+        if api_key not in self._budgets:
+            budget = self._budgets[api_key] = ApiKeyBudget()
+            if self._stored_budgets and (
+                stored := self._stored_budgets.get(_key_id(api_key))
+            ):
+                budget.restore(stored)
+        return self._budgets[api_key]
+
+    async def async_load_budgets(self) -> None:
+        """Load the API key counters saved by the previous run.
+
+        Until they are loaded, the counters are neither restored nor saved,
+        so saved counters are not overwritten by budgets that missed them.
+        """
+        if self._stored_budgets is None:
+            self._stored_budgets = await self._budget_store.async_load() or {}
+
+    @callback
+    def _async_save_budgets(self) -> None:
+        """Save the API key counters after a request was counted."""
+        if self._stored_budgets is not None:
+            self._budget_store.async_delay_save(
+                self._budgets_to_store, STORAGE_SAVE_DELAY
+            )
+
+    @callback
+    def _budgets_to_store(self) -> dict[str, dict[str, Any]]:
+        """Return today's counters of every API key, in use or not."""
+        today = dt_util.utcnow().date().isoformat()
+        stored = {
+            key_id: counters
+            for key_id, counters in (self._stored_budgets or {}).items()
+            if counters.get("day") == today
+        }
+        stored.update(
+            (_key_id(api_key), budget.as_stored())
+            for api_key, budget in self._budgets.items()
+        )
+        return stored
+
+    def poll_offset(self, interval: float) -> float:
+        """Return the start offset, in seconds, of the next polling entry.
+
+        Offsets follow the golden ratio sequence, which keeps entries spread
+        evenly over the interval however many of them there are, plus a
+        random jitter.
+        """
+        self._poll_slots += 1
+        slot = self._poll_slots * _GOLDEN_RATIO_FRACTION % 1
+        return slot * interval + random.uniform(0, POLL_STAGGER_JITTER)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Return the circuit breaker of the host of a URL."""
+        host = urlsplit(url).hostname or ""
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(host)
+        return self._breakers[host]
+
+    async def async_get_json(
+        self,
+        url: str,
+        api_key: str,
+        priority: int = PRIORITY_HIGH,
+        parse: Callable[[Any], Any] | None = None,
+    ) -> Any:
+        """Return the decoded JSON response of a GET request.
+
+        When given, parse is applied to the decoded payload and its result
+        returned instead. Raises RequestDeferred when the API key budget does
+        not allow the request.
+        """
+        if (cached := self._cached(url)) is not None and (
+            time.time() < cached.fresh_until
+        ):
+            self.cache_hits += 1
+            return cached.result
+        if (task := self._in_flight.get(url)) is None:
+            task = self._hass.async_create_background_task(
+                self._async_request(url, api_key, priority, parse),
+                f"{__name__} {url}",
+            )
+            self._in_flight[url] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(url, None))
+        # shield the shared request from callers that are cancelled
+        return await asyncio.shield(task)
+
+    async def async_get_forecast(
+        self,
+        url: str,
+        api_key: str,
+        max_age: float,
+        parse: Callable[
+            [dict[str, Any]], WundergroundPWSForecast | WundergroundPWSHourlyForecast
+        ],
+    ) -> WundergroundPWSForecast | WundergroundPWSHourlyForecast | None:
+        """Return a parsed forecast, reusing one fetched for another entry.
+
+        A cached forecast is reused until it expires or is older than max_age
+        seconds. The payload is decoded and parsed in one go, so only the
+        parsed forecast is kept. Errors raised by parse are passed on and
+        nothing is cached.
+        """
+        if (cached := self._cached(url)) is not None:
+            now = time.time()
+            expires = cached.result.expires
+            # a revalidated forecast may be past its expiration, it is then
+            # kept for max_age like a forecast without one
+            if now < cached.fetched + max_age and (
+                expires is None or expires <= cached.fetched or now < expires
+            ):
+                self.cache_hits += 1
+                return cached.result
+        return await self.async_get_json(url, api_key, PRIORITY_LOW, parse)
+
+    async def async_forward_upload(self, query_string: str) -> None:
+        """Forward a station upload received locally to Weather Underground."""
+        try:
+            async with timeout(DEFAULT_TIMEOUT):
+                response = await self.session.get(
+                    f"{PUSH_FORWARD_URL}?{query_string}", headers=HEADERS
+                )
+                response.release()
+        except (TimeoutError, aiohttp.ClientError) as err:
+            _LOGGER.debug(
+                "Error forwarding station upload: %s",
+                _redact(repr(err), query_string),
+            )
+
+    async def _async_request(
+        self,
+        url: str,
+        api_key: str,
+        priority: int,
+        parse: Callable[[Any], Any] | None,
+    ) -> Any:
+        """Send one request within the budget of its API key.
+
+        The request is conditional when the URL is cached. Timeouts,
+        connection errors and server errors are retried after a jittered
+        exponential backoff, unless the host's circuit breaker opens. Other
+        error responses are classified without decoding their body: 401
+        raises InvalidApiKey, 204 StationOffline and 429 pauses the API key
+        for its Retry-After and raises RequestDeferred. Large responses are
+        decoded and parsed in the executor to keep them off the event loop.
+        """
+        cached = self._cached(url)
+        headers = HEADERS if cached is None else {**HEADERS, **cached.validators}
+        breaker = self.breaker(url)
+        for attempt in range(RETRY_ATTEMPTS):
+            breaker.before_request()
+            try:
+                await self.budget(api_key).async_acquire(priority)
+            finally:
+                self._async_save_budgets()
+            try:
+                response, body = await self._async_get(url, headers)
+            except (TimeoutError, aiohttp.ClientError) as err:
+                breaker.record_failure()
+                if attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                delay = random.uniform(
+                    0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2**attempt)
+                )
+                _LOGGER.debug(
+                    "Retrying %s in %.1f s after %s",
+                    urlsplit(url).path,
+                    delay,
+                    _redact(repr(err), api_key),
+                )
+                await asyncio.sleep(delay)
+            else:
+                breaker.record_success()
+                break
+
+        if cached is not None and response.status == HTTPStatus.NOT_MODIFIED:
+            cached.revalidated(response.headers)
+            self.cache_hits += 1
+            return cached.result
+        if response.status == HTTPStatus.UNAUTHORIZED:
+            raise InvalidApiKey(f"API key rejected by {urlsplit(url).path}")
+        if response.status == HTTPStatus.NO_CONTENT:
+            raise StationOffline(f"No data from {urlsplit(url).path}")
+        if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+            delay = _retry_after(response.headers)
+            self.budget(api_key).pause(delay)
+            raise RequestDeferred(f"Rate limited by the API for {delay:.0f} s")
+        # raises ClientResponseError for any other error status
+        response.raise_for_status()
+        self.cache_misses += 1
+        if not body:
+            return None
+
+        start = time.perf_counter()
+        if len(body) > JSON_EXECUTOR_THRESHOLD:
+            result = await self._hass.async_add_executor_job(_decode, body, parse)
+        else:
+            result = _decode(body, parse)
+        decode_ms = (time.perf_counter() - start) * 1000
+        _LOGGER.debug(
+            "Decoded %d bytes from %s in %.2f ms",
+            len(body),
+            urlsplit(url).path,
+            decode_ms,
+        )
+        self._cache[url] = _CachedResponse.from_response(
+            result,
+            response.headers,
+            {"bytes": len(body), "decode_ms": round(decode_ms, 2)},
+        )
+        self._cache.move_to_end(url)
+        while len(self._cache) > API_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    async def _async_get(
+        self, url: str, headers: Mapping[str, str]
+    ) -> tuple[aiohttp.ClientResponse, bytes | None]:
+        """Send one GET request, raising ClientResponseError on server errors.
+
+        The body is only read from successful responses. The phase timings of
+        the request are logged and kept in request_timings.
+        """
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        try:
+            async with self.session.get(
+                url,
+                headers=headers,
+                timeout=REQUEST_TIMEOUT,
+                trace_request_ctx=timings,
+            ) as response:
+                if response.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                    response.raise_for_status()
+                if response.status != HTTPStatus.OK:
+                    return response, None
+                return response, await response.read()
+        finally:
+            timings["total"] = round((time.perf_counter() - start) * 1000, 1)
+            path = urlsplit(url).path
+            self.request_timings[path] = timings
+            _LOGGER.debug("Request timings of %s (ms): %s", path, timings)
+
+
+def _decode(body: bytes, parse: Callable[[Any], Any] | None) -> Any:
+    """Decode a JSON response body, then parse it when a parser is given."""
+    result = json_loads(body)
+    return result if parse is None else parse(result)
@@ -3,27 +3,42 @@
 from __future__ import annotations
 
 from asyncio import timeout
+from collections.abc import Mapping
 from http import HTTPStatus
 import logging
+from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE
 from homeassistant.core import callback
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.config_validation import latitude, longitude
 
+from .api import HEADERS, InvalidApiKey, InvalidStationId, async_get_api_client
 from .const import (
+    API_BASE_URL,
+    CONF_ADAPTIVE_POLLING,
     CONF_CALENDARDAYTEMPERATURE,
+    CONF_FORECAST_INTERVAL,
     CONF_FORECAST_SENSORS,
     CONF_LANG,
+    CONF_LOCAL_PUSH,
+    CONF_MAX_STALENESS,
     CONF_NUMERIC_PRECISION,
+    CONF_PUSH_FORWARD,
+    CONF_PUSH_PASSWORD,
     CONF_PWS_ID,
+    DEFAULT_ADAPTIVE_POLLING,
     DEFAULT_CALENDARDAYTEMPERATURE,
+    DEFAULT_FORECAST_INTERVAL,
     DEFAULT_FORECAST_SENSORS,
     DEFAULT_LANG,
+    DEFAULT_LOCAL_PUSH,
+    DEFAULT_MAX_STALENESS,
     DEFAULT_NUMERIC_PRECISION,
+    DEFAULT_PUSH_FORWARD,
+    DEFAULT_PUSH_PASSWORD,
     DEFAULT_TIMEOUT,
     DOMAIN,
     FIELD_LATITUDE,
@@ -31,7 +46,6 @@ from .const import (
     FIELD_OBSERVATIONS,
     LANG_CODES,
 )
-from .coordinator import InvalidApiKey, InvalidStationId
 
 
 class InvalidApiResponse(Exception):
@@ -45,6 +59,7 @@ class WundergrounPWSFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a WundergrounPWS config flow."""
 
     VERSION = 1
+    _reauth_entry: config_entries.ConfigEntry
 
     @staticmethod
     @callback
@@ -69,22 +84,20 @@ class WundergrounPWSFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input[CONF_PWS_ID] is None or user_input[CONF_PWS_ID] == "":
             raise InvalidStationId
 
-        session = async_create_clientsession(self.hass)
+        session = async_get_api_client(self.hass).session
         pws_id = user_input[CONF_PWS_ID]
         api_key = user_input[CONF_API_KEY]
-        headers = {
-            "Accept-Encoding": "gzip",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36",
-        }
 
         async with timeout(DEFAULT_TIMEOUT):
             url = (
-                f"https://api.weather.com/v2/pws/observations/current?stationId={pws_id}&format=json&units=e"
+                f"{API_BASE_URL}/v2/pws/observations/current?stationId={pws_id}&format=json&units=e"
                 f"&apiKey={api_key}"
             )
-            response = await session.get(url, headers=headers)
+            response = await session.get(url, headers=HEADERS)
 
         if response.status != HTTPStatus.OK:
+            # hand the connection back to the shared pool
+            response.release()
             if response.status == HTTPStatus.UNAUTHORIZED:
                 _LOGGER.error(
                     "WundergroundPWS config responded with HTTP error %s: %s",
@@ -145,9 +158,47 @@ class WundergrounPWSFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_LANG: DEFAULT_LANG,
                 CONF_CALENDARDAYTEMPERATURE: DEFAULT_CALENDARDAYTEMPERATURE,
                 CONF_FORECAST_SENSORS: DEFAULT_FORECAST_SENSORS,
+                CONF_FORECAST_INTERVAL: DEFAULT_FORECAST_INTERVAL,
+                CONF_MAX_STALENESS: DEFAULT_MAX_STALENESS,
+                CONF_ADAPTIVE_POLLING: DEFAULT_ADAPTIVE_POLLING,
+                CONF_LOCAL_PUSH: DEFAULT_LOCAL_PUSH,
+                CONF_PUSH_FORWARD: DEFAULT_PUSH_FORWARD,
+                CONF_PUSH_PASSWORD: DEFAULT_PUSH_PASSWORD,
             },
         )
 
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]):
+        """Handle an API key rejected while polling."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        """Ask for a new API key."""
+        errors = {}
+        if user_input is not None:
+            data = {**self._reauth_entry.data, CONF_API_KEY: user_input[CONF_API_KEY]}
+            try:
+                await self._validate_user_input(data)
+            except InvalidApiKey:
+                errors["base"] = "invalid_api_key"
+            except InvalidStationId:
+                errors["base"] = "invalid_station_id"
+            except InvalidApiResponse:
+                errors["base"] = "unknown_error"
+            else:
+                return self.async_update_reload_and_abort(self._reauth_entry, data=data)
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_API_KEY): str}),
+            description_placeholders={
+                CONF_PWS_ID: self._reauth_entry.data[CONF_PWS_ID]
+            },
+            errors=errors,
+        )
+
     async def _show_setup_form(self, errors=None):
         """Show the setup form to the user."""
         return self.async_show_form(
@@ -202,6 +253,42 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                             CONF_CALENDARDAYTEMPERATURE, DEFAULT_CALENDARDAYTEMPERATURE
                         ),
                     ): bool,
+                    vol.Optional(
+                        CONF_FORECAST_INTERVAL,
+                        default=self._config_entry.options.get(
+                            CONF_FORECAST_INTERVAL, DEFAULT_FORECAST_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=15, max=360)),
+                    vol.Optional(
+                        CONF_MAX_STALENESS,
+                        default=self._config_entry.options.get(
+                            CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self._config_entry.options.get(
+                            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_LOCAL_PUSH,
+                        default=self._config_entry.options.get(
+                            CONF_LOCAL_PUSH, DEFAULT_LOCAL_PUSH
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PUSH_FORWARD,
+                        default=self._config_entry.options.get(
+                            CONF_PUSH_FORWARD, DEFAULT_PUSH_FORWARD
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PUSH_PASSWORD,
+                        default=self._config_entry.options.get(
+                            CONF_PUSH_PASSWORD, DEFAULT_PUSH_PASSWORD
+                        ),
+                    ): str,
                     vol.Inclusive(
                         CONF_LATITUDE,
                         "coordinates",
@@ -4,6 +4,7 @@ For more details about this platform, please refer to the documentation at
 https://github.com/cytech/Home-Assistant-wundergroundpws/tree/v2.X.X
 """
 
+import os
 from typing import Final
 
 from homeassistant.components.weather import (
@@ -33,6 +34,12 @@ CONF_NUMERIC_PRECISION = "numeric_precision"
 CONF_LANG = "lang"
 CONF_CALENDARDAYTEMPERATURE = "calendarday_temp"
 CONF_FORECAST_SENSORS = "forecast_sensors"
+CONF_FORECAST_INTERVAL = "forecast_interval"
+CONF_MAX_STALENESS = "max_staleness"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_LOCAL_PUSH = "local_push"
+CONF_PUSH_FORWARD = "push_forward"
+CONF_PUSH_PASSWORD = "push_password"
 
 ENTRY_PWS_ID = "pws_id"
 ENTRY_WEATHER_COORDINATOR = "weather_coordinator"
@@ -160,12 +167,95 @@ ICON_CONDITION_MAP: Final[dict[str, list[int]]] = {
     ATTR_CONDITION_WINDY: [23, 24],
     ATTR_CONDITION_WINDY_VARIANT: [],
 }
+# iconCodes are 0-47
+ICON_CODE_COUNT: Final = 48
+# dayOrNight values of the forecast daypart
+DAY: Final = "D"
+NIGHT: Final = "N"
+# Conditions that differ from ICON_CONDITION_MAP by day or by night
+ICON_CONDITION_DAY: Final[dict[int, str]] = {
+    31: ATTR_CONDITION_SUNNY,
+    33: ATTR_CONDITION_SUNNY,
+}
+ICON_CONDITION_NIGHT: Final[dict[int, str]] = {
+    32: ATTR_CONDITION_CLEAR_NIGHT,
+    34: ATTR_CONDITION_CLEAR_NIGHT,
+}
+
+DATA_API_CLIENT = f"{DOMAIN}_api_client"
+DATA_PUSH_RECEIVERS = f"{DOMAIN}_push_receivers"
+DATA_TRANSLATIONS = f"{DOMAIN}_translations"
+# Number of sensor translation tables (languages) kept in memory
+TRANSLATION_CACHE_SIZE = 4
+# Number of API responses (about 3 per entry) kept by the API client
+API_CACHE_SIZE = 200
+STORAGE_KEY = DOMAIN + ".{}"
+# Daily API key counters, kept across restarts
+STORAGE_KEY_BUDGETS = DOMAIN + ".api_key_budgets"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60  # seconds
 
+# Base URL of the TWC API, can point at the offline stand-in in tools/
+API_BASE_URL = os.environ.get(
+    "WUNDERGROUNDPWS_API_BASE_URL", "https://api.weather.com"
+).rstrip("/")
 DEFAULT_TIMEOUT = 30
+# Connection pool of the API client, shared by all config entries
+CONNECTION_LIMIT = 10
+DNS_CACHE_TTL = 300  # seconds
+# Idle connections are kept open across the default 5 minute poll interval
+KEEPALIVE_TIMEOUT = 330  # seconds
+# API requests: connect and read timeouts, in seconds
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+# Attempts of an API request, retried after a jittered exponential backoff
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 1  # seconds, doubled on every retry
+RETRY_BACKOFF_MAX = 10  # seconds
+# Seconds the API key is paused after a 429 response without Retry-After
+RATE_LIMIT_BACKOFF = 60
+# Requests to a host are suspended after this many consecutive failures
+BREAKER_FAILURES = 5
+# Seconds before a single probe request is let through to a suspended host
+BREAKER_RESET = 300
+# Weather Underground PWS API key limits, shared by all config entries
+API_KEY_CALLS_PER_MINUTE = 30
+API_KEY_CALLS_PER_DAY = 1500
+API_KEY_BURST = 5
+# Share of the daily quota kept for observations, forecasts are deferred below it
+API_KEY_DAILY_RESERVE = 0.1
+# Bounds of the adaptive observation poll interval, in seconds
+ADAPTIVE_POLL_MIN = 60
+ADAPTIVE_POLL_MAX = 600
+# Delay after the expected station upload before polling, in seconds
+ADAPTIVE_POLL_GRACE = 15
+# Number of station uploads the upload period is learned from
+ADAPTIVE_POLL_SAMPLES = 8
+# Random extra delay of the first poll of an entry, in seconds
+POLL_STAGGER_JITTER = 10
+# Station uploads in the WU updateweatherstation protocol
+PUSH_PATH = "/weatherstation/updateweatherstation.php"
+PUSH_FORWARD_URL = "https://rtupdate.wunderground.com" + PUSH_PATH
+# Observations are polled again when no upload arrived for this long, in seconds
+PUSH_TIMEOUT = 600
+# Decimal places of the forecast geocode (~1 km), shared by nearby stations
+FORECAST_GEOCODE_PRECISION = 2
+# Responses larger than this are decoded in the executor, in bytes
+JSON_EXECUTOR_THRESHOLD = 65536
+# Hourly forecast is kept until it expires, at most this many seconds
+HOURLY_FORECAST_TTL = 1800
+# Upper bounds of the request latency histogram buckets, in milliseconds
+LATENCY_BUCKETS: Final = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
 DEFAULT_NUMERIC_PRECISION = "none"
 DEFAULT_LANG = "en-US"
 DEFAULT_CALENDARDAYTEMPERATURE = False
 DEFAULT_FORECAST_SENSORS = False
+DEFAULT_FORECAST_INTERVAL = 60  # minutes
+DEFAULT_MAX_STALENESS = 30  # minutes
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_LOCAL_PUSH = False
+DEFAULT_PUSH_FORWARD = False
+DEFAULT_PUSH_PASSWORD = ""
 MAX_FORECAST_DAYS: Final = 5
 API_IMPERIAL: Final = "imperial"
 API_METRIC: Final = "metric"
@@ -181,6 +271,7 @@ RATE = 5
 PERCENTAGEUNIT = 6
 
 FEATURE_CONDITIONS = "conditions"
+FEATURE_DIAGNOSTICS = "diagnostics"
 FEATURE_FORECAST = "forecast"
 FEATURE_FORECAST_DAYPART = "forecast_daypart"
 FEATURE_OBSERVATIONS = "observations"
@@ -193,15 +284,25 @@ FIELD_CONDITION_WINDSPEED = "windSpeed"
 FIELD_DAYPART = "daypart"
 FIELD_FORECAST_CALENDARDAYTEMPERATUREMAX = "calendarDayTemperatureMax"
 FIELD_FORECAST_CALENDARDAYTEMPERATUREMIN = "calendarDayTemperatureMin"
+FIELD_FORECAST_CLOUDCOVER = "cloudCover"
 FIELD_FORECAST_DAYOFWEEK = "dayOfWeek"
+FIELD_FORECAST_DAYORNIGHT = "dayOrNight"
 FIELD_FORECAST_DAYPARTNAME = "daypartName"
+FIELD_FORECAST_EXPIRATIONTIMEUTC = "expirationTimeUtc"
 FIELD_FORECAST_EXPIRED = "expired"
 FIELD_FORECAST_ICONCODE = "iconCode"
 FIELD_FORECAST_PRECIPCHANCE = "precipChance"
+FIELD_FORECAST_PRESSUREMEANSEALEVEL = "pressureMeanSeaLevel"
 FIELD_FORECAST_QPF = "qpf"
+FIELD_FORECAST_RELATIVEHUMIDITY = "relativeHumidity"
+FIELD_FORECAST_TEMPERATURE = "temperature"
+FIELD_FORECAST_TEMPERATUREDEWPOINT = "temperatureDewPoint"
+FIELD_FORECAST_TEMPERATUREFEELSLIKE = "temperatureFeelsLike"
 FIELD_FORECAST_TEMPERATUREMAX = "temperatureMax"
 FIELD_FORECAST_TEMPERATUREMIN = "temperatureMin"
+FIELD_FORECAST_UVINDEX = "uvIndex"
 FIELD_FORECAST_VALIDTIMEUTC = "validTimeUtc"
+FIELD_FORECAST_WINDDIRECTION = "windDirection"
 FIELD_FORECAST_WINDDIRECTIONCARDINAL = "windDirectionCardinal"
 FIELD_FORECAST_WINDSPEED = "windSpeed"
 FIELD_FORECAST_WXPHRASELONG = "wxPhraseLong"
@@ -209,3 +310,4 @@ FIELD_FORECAST_WXPHRASESHORT = "wxPhraseShort"
 FIELD_LATITUDE = "lat"
 FIELD_LONGITUDE = "lon"
 FIELD_OBSERVATIONS = "observations"
+FIELD_OBSERVATION_EPOCH = "epoch"
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
-from asyncio import timeout
-from dataclasses import dataclass
-from datetime import timedelta
+import asyncio
+from collections import Counter, deque
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
 import logging
+import statistics
+import time
 from typing import Any
 
 import aiohttp
 
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
     UnitOfLength,
@@ -18,41 +23,100 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfVolumetricFlux,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
+from .api import InvalidApiKey, RequestDeferred, StationOffline, async_get_api_client
 from .const import (
-    DEFAULT_TIMEOUT,
+    ADAPTIVE_POLL_GRACE,
+    ADAPTIVE_POLL_MAX,
+    ADAPTIVE_POLL_MIN,
+    ADAPTIVE_POLL_SAMPLES,
+    API_BASE_URL,
+    DAY,
+    FEATURE_CONDITIONS,
+    FEATURE_FORECAST,
+    FEATURE_FORECAST_DAYPART,
+    FEATURE_OBSERVATIONS,
     FIELD_CONDITION_HUMIDITY,
     FIELD_CONDITION_WINDDIR,
-    FIELD_DAYPART,
     FIELD_FORECAST_CALENDARDAYTEMPERATUREMAX,
     FIELD_FORECAST_CALENDARDAYTEMPERATUREMIN,
+    FIELD_FORECAST_DAYOFWEEK,
     FIELD_FORECAST_TEMPERATUREMAX,
     FIELD_FORECAST_TEMPERATUREMIN,
     FIELD_FORECAST_VALIDTIMEUTC,
-    FIELD_LATITUDE,
-    FIELD_LONGITUDE,
-    FIELD_OBSERVATIONS,
+    FORECAST_GEOCODE_PRECISION,
+    HOURLY_FORECAST_TTL,
+    ICON_CODE_COUNT,
+    ICON_CONDITION_DAY,
     ICON_CONDITION_MAP,
+    ICON_CONDITION_NIGHT,
+    NIGHT,
+    PUSH_TIMEOUT,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
 )
+from .metrics import CoordinatorMetrics
+from .model import (
+    WundergroundPWSData,
+    WundergroundPWSForecast,
+    WundergroundPWSHourlyForecast,
+    WundergroundPWSObservation,
+)
+from .push import async_register_push_receiver, parse_station_upload
 
 _LOGGER = logging.getLogger(__name__)
 
 _RESOURCESHARED = "&format=json&apiKey={apiKey}&units={units}"
-_RESOURCECURRENT = (
-    "https://api.weather.com/v2/pws/observations/current?stationId={stationId}"
-)
+_RESOURCECURRENT = API_BASE_URL + "/v2/pws/observations/current?stationId={stationId}"
 _RESOURCEFORECAST = (
-    "https://api.weather.com/v3/wx/forecast/daily/5day?geocode={latitude},{longitude}"
+    API_BASE_URL + "/v3/wx/forecast/daily/5day?geocode={latitude},{longitude}"
+)
+_RESOURCEHOURLY = (
+    API_BASE_URL + "/v3/wx/forecast/hourly/2day?geocode={latitude},{longitude}"
 )
+# API resource -> name of its request metrics
+_ENDPOINTS = {
+    _RESOURCECURRENT: "observations",
+    _RESOURCEFORECAST: "forecast",
+    _RESOURCEHOURLY: "hourly_forecast",
+}
 
 MIN_TIME_BETWEEN_UPDATES = timedelta(minutes=5)
 
 
+def _icon_condition_table(
+    overrides: dict[int, str] | None = None,
+) -> tuple[str | None, ...]:
+    """Build the iconCode -> condition lookup table, indexed by iconCode."""
+    table: list[str | None] = [None] * ICON_CODE_COUNT
+    for condition, iconcodes in ICON_CONDITION_MAP.items():
+        for icon_code in iconcodes:
+            table[icon_code] = condition
+    for icon_code, condition in (overrides or {}).items():
+        table[icon_code] = condition
+    return tuple(table)
+
+
+_ICON_CONDITIONS = _icon_condition_table()
+# dayOrNight of the forecast daypart -> lookup table
+_ICON_CONDITION_TABLES = {
+    DAY: _icon_condition_table(ICON_CONDITION_DAY),
+    NIGHT: _icon_condition_table(ICON_CONDITION_NIGHT),
+}
+_unmapped_icon_codes: set[Any] = set()
+
+# Features served by each API endpoint
+OBSERVATION_FEATURES = frozenset({FEATURE_CONDITIONS, FEATURE_OBSERVATIONS})
+FORECAST_FEATURES = frozenset({FEATURE_FORECAST, FEATURE_FORECAST_DAYPART})
+
+
 @dataclass
 class WundergroundPWSUpdateCoordinatorConfig:
     """Class representing coordinator configuration."""
@@ -67,6 +131,12 @@ class WundergroundPWSUpdateCoordinatorConfig:
     latitude: str
     longitude: str
     forecast_enable: bool
+    forecast_interval: timedelta
+    max_staleness: timedelta
+    adaptive_polling: bool
+    local_push: bool
+    push_forward: bool
+    push_password: str
     update_interval = MIN_TIME_BETWEEN_UPDATES
     tranfile: str
 
@@ -74,10 +144,11 @@ class WundergroundPWSUpdateCoordinatorConfig:
 class WundergroundPWSUpdateCoordinator(DataUpdateCoordinator):
     """The WundergroundPWS update coordinator."""
 
-    icon_condition_map = ICON_CONDITION_MAP
-
     def __init__(
-        self, hass: HomeAssistant, config: WundergroundPWSUpdateCoordinatorConfig
+        self,
+        hass: HomeAssistant,
+        config: WundergroundPWSUpdateCoordinatorConfig,
+        config_entry: ConfigEntry | None = None,
     ) -> None:
         """Initialize."""
         self._hass = hass
@@ -91,9 +162,37 @@ class WundergroundPWSUpdateCoordinator(DataUpdateCoordinator):
         self._latitude = config.latitude
         self._longitude = config.longitude
         self.forecast_enable = config.forecast_enable
-        self._features = set()
-        self.data = None
-        self._session = async_get_clientsession(self._hass)
+        self._forecast_interval = config.forecast_interval
+        self._forecast_expires = 0.0
+        self._max_staleness = config.max_staleness
+        self.data_updated: datetime | None = None
+        self._adaptive_polling = config.adaptive_polling
+        self._poll_interval = config.update_interval
+        self._upload_epochs: deque[int] = deque(maxlen=ADAPTIVE_POLL_SAMPLES)
+        self.push_forward = config.push_forward
+        self.push_password = config.push_password
+        self._last_push: float | None = None
+        self._unregister_push: CALLBACK_TYPE | None = None
+        self._forecast_only = False
+        self._features: Counter[str] = Counter()
+        self.metrics = CoordinatorMetrics()
+        self.data: WundergroundPWSData | None = None
+        self._observation: WundergroundPWSObservation | None = None
+        self._forecast: WundergroundPWSForecast | None = None
+        self._hourly_forecast: WundergroundPWSHourlyForecast | None = None
+        self._hourly_forecast_expires = 0.0
+        self._current_version = 0
+        self._forecast_version = 0
+        self._client = async_get_api_client(hass)
+        self._release_budget = self._client.budget(self._api_key).register()
+        self._poll_offset: float | None = self._client.poll_offset(
+            config.update_interval.total_seconds()
+        )
+        self._store: Store | None = (
+            Store(hass, STORAGE_VERSION, STORAGE_KEY.format(config_entry.entry_id))
+            if config_entry is not None
+            else None
+        )
         self._tranfile = config.tranfile
 
         if self._unit_system_api == "m":
@@ -120,6 +219,7 @@ class WundergroundPWSUpdateCoordinator(DataUpdateCoordinator):
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name="WundergroundPWSUpdateCoordinator",
             update_interval=config.update_interval,
         )
@@ -134,75 +234,452 @@ class WundergroundPWSUpdateCoordinator(DataUpdateCoordinator):
         """Return the location used for data."""
         return self._pws_id
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        return await self.get_weather()
+    @property
+    def diagnostic_data(self) -> dict[str, Any]:
+        """Return the data read by the diagnostic sensors."""
+        return {
+            **self._client.budget(self._api_key).as_dict(),
+            "cache_hits": self._client.cache_hits,
+            "cache_misses": self._client.cache_misses,
+            "data_updated": self.data_updated,
+            "update_duration": self.metrics.update_ms,
+            "fanout_duration": self.metrics.fanout_ms,
+            "update_failures": self.metrics.update_failures,
+            "last_error": self.metrics.last_error,
+            **{
+                f"{name}_latency": endpoint.last_latency_ms
+                for name, endpoint in self.metrics.endpoints.items()
+            },
+        }
+
+    async def _async_update_data(self) -> WundergroundPWSData:
+        start = time.perf_counter()
+        try:
+            return await self.get_weather()
+        except ConfigEntryAuthFailed as err:
+            self.metrics.record_failure(self._scrub(repr(err)))
+            raise
+        finally:
+            self.metrics.record_update((time.perf_counter() - start) * 1000)
+            _LOGGER.debug(
+                "WUnderground update of %s took %.1f ms",
+                self._pws_id,
+                self.metrics.update_ms,
+            )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing the fan-out."""
+        start = time.perf_counter()
+        super().async_update_listeners()
+        self.metrics.fanout_ms = round((time.perf_counter() - start) * 1000, 2)
 
     async def get_weather(self):
-        """Get weather data."""
-        headers = {
-            "Accept-Encoding": "gzip",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36",
+        """Get weather data.
+
+        Only endpoints with a registered feature are requested. Observations
+        are requested on every update unless the station pushes them, the
+        forecast only once it has expired.
+        When both are due and the forecast geocode is already known, they are
+        requested concurrently. A failed forecast keeps the previous one.
+        An API key rejected by the API raises ConfigEntryAuthFailed, which
+        starts a reauthentication.
+        """
+        self._stagger_next_poll()
+        fetch_current = (
+            self._observation is None
+            or not (self._latitude and self._longitude)
+            or (
+                not self._forecast_only
+                and self._feature_requested(OBSERVATION_FEATURES)
+                and not self._receiving_pushes()
+            )
+        )
+        self._forecast_only = False
+        fetch_forecast = (
+            self._feature_requested(FORECAST_FEATURES)
+            and time.time() >= self._forecast_expires
+        )
+        forecast = None
+        try:
+            if fetch_current and fetch_forecast and self._latitude and self._longitude:
+                observation, forecast = await asyncio.gather(
+                    self._fetch(_RESOURCECURRENT),
+                    self._fetch(_RESOURCEFORECAST),
+                    return_exceptions=True,
+                )
+                if isinstance(observation, BaseException):
+                    raise observation
+                if isinstance(forecast, InvalidApiKey):
+                    raise forecast
+            elif fetch_current:
+                observation = await self._fetch(_RESOURCECURRENT)
+            else:
+                observation = self._observation
+        except InvalidApiKey as err:
+            raise ConfigEntryAuthFailed(err) from err
+        except StationOffline as err:
+            return self._stale_data(f"WUnderground station offline: {err}")
+        except (TimeoutError, aiohttp.ClientError, RequestDeferred, ValueError) as err:
+            return self._stale_data(f"Error fetching WUnderground data: {err!r}")
+
+        if observation is None:
+            return self._stale_data("Check WUnderground API NO CURRENT RESULT")
+        if observation != self._observation:
+            self._current_version += 1
+        if fetch_current:
+            self._schedule_next_poll(observation)
+            # the staleness budget only restarts when an observation arrived
+            self.data_updated = dt_util.utcnow()
+        self._observation = observation
+
+        if not self._longitude:
+            self._longitude = observation.lon
+        if not self._latitude:
+            self._latitude = observation.lat
+
+        if fetch_forecast:
+            if forecast is None:
+                try:
+                    forecast = await self._fetch(_RESOURCEFORECAST)
+                except InvalidApiKey as err:
+                    raise ConfigEntryAuthFailed(err) from err
+                except (
+                    TimeoutError,
+                    aiohttp.ClientError,
+                    RequestDeferred,
+                    StationOffline,
+                    ValueError,
+                ) as err:
+                    forecast = err
+
+            if isinstance(forecast, RequestDeferred):
+                _LOGGER.debug(
+                    "WUnderground forecast deferred: %s", self._scrub(repr(forecast))
+                )
+            elif isinstance(forecast, BaseException):
+                _LOGGER.error(
+                    "Error fetching WUnderground forecast: %s",
+                    self._scrub(repr(forecast)),
+                )
+            elif forecast is None:
+                _LOGGER.error("Check WUnderground API NO FORECAST RESULT")
+            else:
+                if forecast != self._forecast:
+                    self._forecast_version += 1
+                self._forecast = forecast
+                self._forecast_expires = self._forecast_expiration(
+                    forecast, self._forecast_interval.total_seconds()
+                )
+
+        result = WundergroundPWSData(self._observation, self._forecast)
+
+        self.data = result
+        if self._store is not None:
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        return result
+
+    async def async_apply_config(
+        self, config: WundergroundPWSUpdateCoordinatorConfig
+    ) -> None:
+        """Apply changed options to the running coordinator.
+
+        Only the endpoints whose request changed are fetched again, the
+        entities are updated in place.
+        """
+        refetch_current = config.numeric_precision != self._numeric_precision
+        refetch_forecast = (config.lang, config.latitude, config.longitude) != (
+            self._lang,
+            self._latitude,
+            self._longitude,
+        )
+        self._numeric_precision = config.numeric_precision
+        self._lang = config.lang
+        self._tranfile = config.tranfile
+        self._calendarday = config.calendarday
+        self._latitude = config.latitude
+        self._longitude = config.longitude
+        self._forecast_interval = config.forecast_interval
+        self._max_staleness = config.max_staleness
+        self.push_forward = config.push_forward
+        self.push_password = config.push_password
+        if self._adaptive_polling and not config.adaptive_polling:
+            self.update_interval = self._poll_interval
+        self._adaptive_polling = config.adaptive_polling
+        self.async_set_local_push(config.local_push)
+
+        # names and the forecast of the weather entity may change too
+        self._current_version += 1
+        self._forecast_version += 1
+        self.async_update_listeners()
+
+        if refetch_forecast:
+            self._forecast_expires = 0.0
+            self._hourly_forecast_expires = 0.0
+        if refetch_current or refetch_forecast:
+            self._forecast_only = not refetch_current
+            await self.async_request_refresh()
+
+    @callback
+    def async_set_local_push(self, enabled: bool) -> None:
+        """Start or stop receiving station uploads locally."""
+        if enabled and self._unregister_push is None:
+            if not self.push_password:
+                _LOGGER.warning(
+                    "Uploads of station %s are rejected until an upload "
+                    "password is set",
+                    self._pws_id,
+                )
+            self._unregister_push = async_register_push_receiver(self.hass, self)
+        elif not enabled and self._unregister_push is not None:
+            self._unregister_push()
+            self._unregister_push = None
+            self._last_push = None
+
+    @callback
+    def async_push_observation(self, params: Mapping[str, str]) -> None:
+        """Update the observations from a station upload received locally."""
+        self._observation = replace(
+            self._observation or WundergroundPWSObservation(),
+            **parse_station_upload(params, self.unit_system),
+        )
+        self._last_push = time.monotonic()
+        self._current_version += 1
+        self.data_updated = dt_util.utcnow()
+        self.data = WundergroundPWSData(self._observation, self._forecast)
+        self.last_update_success = True
+        if self._store is not None:
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        # the poll timer keeps running so the forecast is still refreshed
+        self.async_update_listeners()
+
+    def _receiving_pushes(self) -> bool:
+        """Return if the station recently pushed an upload."""
+        return (
+            self._last_push is not None
+            and time.monotonic() - self._last_push < PUSH_TIMEOUT
+        )
+
+    async def async_restore(self) -> bool:
+        """Restore the last good data saved by a previous run.
+
+        Returns False when there is no usable snapshot, e.g. after the unit
+        system, language or station changed.
+        """
+        if self._store is None or (snapshot := await self._store.async_load()) is None:
+            return False
+        if (
+            snapshot.get("pws_id") != self._pws_id
+            or snapshot.get("units") != self._unit_system_api
+            or snapshot.get("lang") != self._lang
+            or not snapshot.get("observation")
+        ):
+            return False
+
+        self._observation = WundergroundPWSObservation.from_dict(
+            snapshot["observation"]
+        )
+        if snapshot.get("forecast"):
+            self._forecast = WundergroundPWSForecast.from_dict(snapshot["forecast"])
+        self._forecast_expires = snapshot.get("forecast_expires", 0.0)
+        self.data_updated = dt_util.parse_datetime(snapshot["data_updated"])
+        self.data = WundergroundPWSData(self._observation, self._forecast)
+        _LOGGER.debug(
+            "Restored WUnderground data for %s from %s",
+            self._pws_id,
+            snapshot["data_updated"],
+        )
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the data saved for the next start."""
+        return {
+            "pws_id": self._pws_id,
+            "units": self._unit_system_api,
+            "lang": self._lang,
+            "data_updated": self.data_updated.isoformat(),
+            "observation": self._observation.as_dict(),
+            "forecast": self._forecast.as_dict() if self._forecast else None,
+            "forecast_expires": self._forecast_expires,
         }
+
+    def _stale_data(self, error: str) -> WundergroundPWSData:
+        """Return the last good data while it is within the staleness budget.
+
+        Raises UpdateFailed, which makes the entities unavailable, once there
+        is no data or it is older than the configured maximum staleness.
+        """
+        error = self._scrub(error)
+        self.metrics.record_failure(error)
+        if (
+            self.data is None
+            or self.data_updated is None
+            or dt_util.utcnow() - self.data_updated > self._max_staleness
+        ):
+            _LOGGER.error(error)
+            raise UpdateFailed(error)
+        _LOGGER.warning(
+            "%s. Keeping data from %s", error, self.data_updated.isoformat()
+        )
+        return self.data
+
+    async def _fetch(
+        self, resource: str
+    ) -> WundergroundPWSObservation | WundergroundPWSForecast | None:
+        """Fetch and parse one API resource, recording the request metrics."""
+        url = self._build_url(resource)
+        endpoint = self.metrics.endpoint(_ENDPOINTS[resource])
+        start = time.perf_counter()
         try:
-            async with timeout(DEFAULT_TIMEOUT):
-                url = self._build_url(_RESOURCECURRENT)
-                response = await self._session.get(url, headers=headers)
-                result_current = await response.json()
-                if result_current is None:
-                    _LOGGER.error("Check WUnderground API NO CURRENT RESULT")
-                    return None
-                self._check_errors(url, result_current)
-
-                if not self._longitude:
-                    self._longitude = result_current[FIELD_OBSERVATIONS][0][
-                        FIELD_LONGITUDE
-                    ]
-                if not self._latitude:
-                    self._latitude = result_current[FIELD_OBSERVATIONS][0][
-                        FIELD_LATITUDE
-                    ]
-
-            async with timeout(DEFAULT_TIMEOUT):
-                url = self._build_url(_RESOURCEFORECAST)
-                response = await self._session.get(url, headers=headers)
-                result_forecast = await response.json()
-
-                if result_forecast is None:
-                    _LOGGER.error("Check WUnderground API NO FORECAST RESULT")
-                    return None
-                self._check_errors(url, result_forecast)
-
-            result = {**result_current, **result_forecast}
-
-            self.data = result
-
-        except (TimeoutError, aiohttp.ClientError) as err:
-            _LOGGER.error("Error fetching WUnderground data: %s", repr(err))
+            result = await self._async_fetch_url(resource, url)
+        except RequestDeferred:
+            # not sent, the budget or the circuit breaker held it back
+            raise
+        except Exception as err:
+            endpoint.record_failure(
+                (time.perf_counter() - start) * 1000, self._scrub(repr(err))
+            )
+            raise
+        endpoint.record_success(
+            (time.perf_counter() - start) * 1000, self._client.payload_stats(url)
+        )
+        return result
+
+    async def _async_fetch_url(
+        self, resource: str, url: str
+    ) -> (
+        WundergroundPWSObservation
+        | WundergroundPWSForecast
+        | WundergroundPWSHourlyForecast
+        | None
+    ):
+        """Fetch and parse one API resource through the shared API client."""
+        if resource == _RESOURCEFORECAST:
+            return await self._client.async_get_forecast(
+                url,
+                self._api_key,
+                self._forecast_interval.total_seconds(),
+                lambda result: self._parse_forecast(url, result),
+            )
+        if resource == _RESOURCEHOURLY:
+            return await self._client.async_get_forecast(
+                url,
+                self._api_key,
+                HOURLY_FORECAST_TTL,
+                lambda result: self._parse_hourly_forecast(url, result),
+            )
+        result = await self._client.async_get_json(url, self._api_key)
+        if result is None:
             return None
-        else:
-            return result
-        # _LOGGER.debug(f'WUnderground data {self.data}')
+        self._check_errors(url, result)
+        return WundergroundPWSObservation.from_json(result, self.unit_system)
+
+    def _parse_forecast(
+        self, url: str, result: dict[str, Any]
+    ) -> WundergroundPWSForecast:
+        """Check and parse a daily forecast payload."""
+        self._check_errors(url, result)
+        return WundergroundPWSForecast.from_json(result)
+
+    def _parse_hourly_forecast(
+        self, url: str, result: dict[str, Any]
+    ) -> WundergroundPWSHourlyForecast:
+        """Check and parse an hourly forecast payload."""
+        self._check_errors(url, result)
+        return WundergroundPWSHourlyForecast.from_json(result)
+
+    @property
+    def hourly_forecast_due(self) -> bool:
+        """Return if the hourly forecast has expired and would be fetched."""
+        return time.time() >= self._hourly_forecast_expires
+
+    async def async_get_hourly_forecast(
+        self,
+    ) -> WundergroundPWSHourlyForecast | None:
+        """Return the hourly forecast, fetching it when it is due.
+
+        Only the weather entity asks for it, while hourly forecasts are
+        subscribed to, so installs that never show hourly data make no
+        hourly requests. A failed request keeps the previous forecast.
+        """
+        if not self.hourly_forecast_due or not (self._latitude and self._longitude):
+            return self._hourly_forecast
+        try:
+            hourly_forecast = await self._fetch(_RESOURCEHOURLY)
+        except RequestDeferred as err:
+            _LOGGER.debug(
+                "WUnderground hourly forecast deferred: %s", self._scrub(repr(err))
+            )
+            return self._hourly_forecast
+        except (
+            TimeoutError,
+            aiohttp.ClientError,
+            InvalidApiKey,
+            StationOffline,
+            ValueError,
+        ) as err:
+            _LOGGER.error(
+                "Error fetching WUnderground hourly forecast: %s",
+                self._scrub(repr(err)),
+            )
+            return self._hourly_forecast
+        if hourly_forecast is not None:
+            self._hourly_forecast = hourly_forecast
+            self._hourly_forecast_expires = self._forecast_expiration(
+                hourly_forecast, HOURLY_FORECAST_TTL
+            )
+        return self._hourly_forecast
+
+    @staticmethod
+    def _forecast_expiration(
+        forecast: WundergroundPWSForecast | WundergroundPWSHourlyForecast,
+        interval: float,
+    ) -> float:
+        """Return when a forecast should be refetched, as a UTC timestamp.
+
+        The forecast is kept until the earliest expirationTimeUtc reported by
+        the API, but never longer than interval seconds. A forecast
+        revalidated after its expiration is kept for the interval.
+        """
+        now = time.time()
+        expires = now + interval
+        if forecast.expires is not None and forecast.expires > now:
+            expires = min(expires, forecast.expires)
+        return expires
 
     def _build_url(self, baseurl):
         """Build a URL for API requests with appropriate parameters."""
+        geocode = {}
         if baseurl == _RESOURCECURRENT:
             if self._numeric_precision != "none":
                 baseurl += "&numericPrecision={numericPrecision}"
-        elif baseurl == _RESOURCEFORECAST:
+        elif baseurl in (_RESOURCEFORECAST, _RESOURCEHOURLY):
             baseurl += "&language={language}"
+            # rounded so that nearby stations share one forecast request,
+            # forecasts are only requested once the coordinates are known
+            geocode = {
+                "latitude": round(float(self._latitude), FORECAST_GEOCODE_PRECISION),
+                "longitude": round(
+                    float(self._longitude), FORECAST_GEOCODE_PRECISION
+                ),
+            }
 
         baseurl += _RESOURCESHARED
 
         return baseurl.format(
             apiKey=self._api_key,
             language=self._lang,
-            latitude=self._latitude,
-            longitude=self._longitude,
             numericPrecision=self._numeric_precision,
+            **geocode,
             stationId=self._pws_id,
             units=self._unit_system_api,
         )
 
+    def _scrub(self, text: str) -> str:
+        """Remove the API key from an error message, URLs include it."""
+        return text.replace(self._api_key, "**REDACTED**")
+
     def _check_errors(self, url: str, response: dict):
         """Check for errors in the API response and raise if found."""
         # _LOGGER.debug(f'Checking errors from {url} in {response}')
@@ -213,25 +690,137 @@ class WundergroundPWSUpdateCoordinator(DataUpdateCoordinator):
                 f"Error from {url}: ; ".join([e["message"] for e in errors])
             )
 
-    def request_feature(self, feature):
-        """Register a feature to be fetched from the WU API."""
-        self._features.add(feature)
+    @callback
+    def request_feature(self, feature: str) -> CALLBACK_TYPE:
+        """Register a feature to be fetched from the WU API.
+
+        Returns a callback that releases the registration again. Registering
+        a feature whose endpoint has not been fetched yet requests a refresh.
+        """
+        self._features[feature] += 1
+        if (feature in FORECAST_FEATURES and self._forecast is None) or (
+            feature in OBSERVATION_FEATURES and self._observation is None
+        ):
+            self.hass.async_create_task(self.async_request_refresh())
+
+        @callback
+        def _release_feature() -> None:
+            self._features[feature] -= 1
+            if self._features[feature] <= 0:
+                del self._features[feature]
+
+        return _release_feature
+
+    def data_version(self, feature: str | None) -> int | None:
+        """Return a number that changes whenever the data of a feature changes.
+
+        Returns None for features that are not read from the API payloads.
+        """
+        if feature in FORECAST_FEATURES:
+            return self._forecast_version
+        if not feature or feature in OBSERVATION_FEATURES:
+            return self._current_version
+        return None
+
+    @property
+    def upload_period(self) -> float | None:
+        """Return the learned upload period of the station, in seconds."""
+        epochs = list(self._upload_epochs)
+        if len(epochs) < 2:
+            return None
+        return statistics.median(
+            later - earlier for earlier, later in zip(epochs, epochs[1:], strict=False)
+        )
+
+    async def async_staggered_refresh(self) -> None:
+        """Refresh once the entry's poll offset has passed.
+
+        Used for the first refresh of entries restored at startup, so they do
+        not all poll at the same second. The offset is then already applied,
+        later polls keep the configured interval.
+        """
+        offset, self._poll_offset = self._poll_offset, None
+        if offset:
+            await asyncio.sleep(offset)
+        await self.async_refresh()
+
+    def _stagger_next_poll(self) -> None:
+        """Move the polls of this entry to its own slot in the interval.
+
+        Entries set up together would otherwise poll at the same second
+        forever. Only the interval after the first update is lengthened by the
+        entry's offset, later polls keep the configured interval and with it
+        the offset.
+        """
+        if self._adaptive_polling:
+            return
+        if self._poll_offset is None:
+            self.update_interval = self._poll_interval
+            return
+        self.update_interval = self._poll_interval + timedelta(
+            seconds=self._poll_offset
+        )
+        self._poll_offset = None
+
+    def _schedule_next_poll(self, observation: WundergroundPWSObservation) -> None:
+        """Adapt the poll interval to the upload cadence of the station.
+
+        The next poll is scheduled just after the next expected upload. When
+        the station did not upload since the last poll, the interval doubles.
+        The interval stays within the configured bounds and the API key quota.
+        """
+        if not self._adaptive_polling:
+            return
+        if (epoch := observation.epoch) is None:
+            return
+
+        if self._upload_epochs and epoch == self._upload_epochs[-1]:
+            interval = self.update_interval.total_seconds() * 2
+        else:
+            self._upload_epochs.append(epoch)
+            if (period := self.upload_period) is None:
+                interval = MIN_TIME_BETWEEN_UPDATES.total_seconds()
+            else:
+                interval = epoch + period + ADAPTIVE_POLL_GRACE - time.time()
+
+        minimum = max(
+            ADAPTIVE_POLL_MIN, self._client.budget(self._api_key).min_poll_interval
+        )
+        self.update_interval = timedelta(
+            seconds=min(max(interval, minimum), max(ADAPTIVE_POLL_MAX, minimum))
+        )
+
+    async def async_shutdown(self) -> None:
+        """Release the API key budget and the push receiver on unload."""
+        self._release_budget()
+        self.async_set_local_push(False)
+        await super().async_shutdown()
+
+    def _feature_requested(self, features: frozenset[str]) -> bool:
+        """Return if any of the features is registered.
+
+        Until the first update has completed nothing has registered yet, so
+        every endpoint is considered requested.
+        """
+        if self.data is None:
+            return True
+        return any(feature in self._features for feature in features)
 
     def get_condition(self, field):
         """Get a condition field from current observations."""
-        if not self.data:
+        if not self.data or self.data.observation is None:
             return None
+        value = getattr(self.data.observation, field, None)
         if field in [
             FIELD_CONDITION_HUMIDITY,
             FIELD_CONDITION_WINDDIR,
         ]:
-            # Those fields are unit-less
-            return self.data[FIELD_OBSERVATIONS][0][field] or 0
-        return self.data[FIELD_OBSERVATIONS][0][self.unit_system][field]
+            return value or 0
+        return value
 
     def get_forecast(self, field, period=0):
         """Get a forecast field for a specific period."""
-        if not self.data:
+        if not self.data or self.data.forecast is None:
             return None
         try:
             if field in [
@@ -240,32 +829,32 @@ class WundergroundPWSUpdateCoordinator(DataUpdateCoordinator):
                 FIELD_FORECAST_CALENDARDAYTEMPERATUREMAX,
                 FIELD_FORECAST_CALENDARDAYTEMPERATUREMIN,
                 FIELD_FORECAST_VALIDTIMEUTC,
+                FIELD_FORECAST_DAYOFWEEK,
             ]:
                 # Those fields exist per-day, rather than per dayPart, so the period is halved
-                return self.data[field][int(period / 2)]
-
-            if FIELD_DAYPART not in self.data:
-                return None
+                return self.data.forecast.days[field][int(period / 2)]
 
-            return self.data[FIELD_DAYPART][0][field][period]
+            return self.data.forecast.dayparts[field][period]
         except KeyError, TypeError, IndexError:
             return None
 
     @classmethod
-    def _iconcode_to_condition(cls, icon_code):
-        for condition, iconcodes in cls.icon_condition_map.items():
-            if icon_code in iconcodes:
-                return condition
-        _LOGGER.warning(
-            'Unmapped iconCode from TWC Api. (44 is Not Available (N/A)) "%s"',
-            icon_code,
-        )
+    def _iconcode_to_condition(cls, icon_code, day_or_night=None):
+        """Map a TWC iconCode to a condition, by day or night when known.
+
+        Unmapped codes are only warned about once per code.
+        """
+        table = _ICON_CONDITION_TABLES.get(day_or_night, _ICON_CONDITIONS)
+        if (
+            isinstance(icon_code, int)
+            and 0 <= icon_code < ICON_CODE_COUNT
+            and (condition := table[icon_code]) is not None
+        ):
+            return condition
+        if icon_code not in _unmapped_icon_codes:
+            _unmapped_icon_codes.add(icon_code)
+            _LOGGER.warning(
+                'Unmapped iconCode from TWC Api. (44 is Not Available (N/A)) "%s"',
+                icon_code,
+            )
         return None
-
-
-class InvalidApiKey(HomeAssistantError):
-    """Error to indicate there is an invalid api key."""
-
-
-class InvalidStationId(HomeAssistantError):
-    """Error to indicate there is an invalid api key."""
@@ -0,0 +1,57 @@
+"""Diagnostics support for WundergroundPWS."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+
+from .api import async_get_api_client
+from .const import CONF_PUSH_PASSWORD, DOMAIN, FIELD_LATITUDE, FIELD_LONGITUDE
+from .coordinator import WundergroundPWSUpdateCoordinator
+
+TO_REDACT = {
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_PUSH_PASSWORD,
+    FIELD_LATITUDE,
+    FIELD_LONGITUDE,
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: WundergroundPWSUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = async_get_api_client(hass)
+    data = coordinator.data
+    return async_redact_data(
+        {
+            "entry": entry.as_dict(),
+            "coordinator": {
+                "last_update_success": coordinator.last_update_success,
+                "update_interval": str(coordinator.update_interval),
+                "upload_period": coordinator.upload_period,
+                "data_updated": coordinator.data_updated,
+                **coordinator.metrics.as_dict(),
+            },
+            "api_key_budget": client.budget(entry.data[CONF_API_KEY]).as_dict(),
+            "api_client": client.as_dict(),
+            "observation": (
+                data.observation.as_dict()
+                if data is not None and data.observation is not None
+                else None
+            ),
+            "forecast_expires": (
+                data.forecast.expires
+                if data is not None and data.forecast is not None
+                else None
+            ),
+        },
+        TO_REDACT,
+    )
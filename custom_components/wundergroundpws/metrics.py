@@ -0,0 +1,160 @@
+"""Update metrics of the WundergroundPWS coordinator.
+
+Each coordinator records how its updates went: per endpoint request
+latencies, payload sizes, decode times and failures, the duration of the
+whole update and of the fan-out to the entities. They are read by the
+diagnostics download and the diagnostic sensors.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import LATENCY_BUCKETS
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Request latencies counted in the LATENCY_BUCKETS buckets."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """Return the number of latencies recorded."""
+        return sum(self.counts)
+
+    def record(self, latency_ms: float) -> None:
+        """Count a latency, in milliseconds."""
+        self.counts[bisect_left(LATENCY_BUCKETS, latency_ms)] += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding a percentile.
+
+        Latencies above the last bucket are reported as the largest seen.
+        """
+        if not (count := self.count):
+            return None
+        rank = count * percent / 100
+        seen = 0
+        for bound, bucket in zip(LATENCY_BUCKETS, self.counts, strict=False):
+            seen += bucket
+            if seen >= rank:
+                return float(bound)
+        return round(self.max_ms, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for the diagnostics."""
+        labels = [f"<={bound}" for bound in LATENCY_BUCKETS]
+        labels.append(f">{LATENCY_BUCKETS[-1]}")
+        return {
+            "buckets_ms": dict(zip(labels, self.counts, strict=True)),
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p95_ms": self.percentile(95),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Requests of one API endpoint made by a coordinator.
+
+    Payload size and decode time are those of the last downloaded response,
+    responses served from the cache keep them.
+    """
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    requests: int = 0
+    failures: int = 0
+    last_latency_ms: float | None = None
+    payload_bytes: int | None = None
+    decode_ms: float | None = None
+    last_error: str | None = None
+    last_error_time: datetime | None = None
+
+    def record_success(
+        self, latency_ms: float, payload: dict[str, float] | None
+    ) -> None:
+        """Record a request that returned data."""
+        self.requests += 1
+        self.last_latency_ms = round(latency_ms, 1)
+        self.latency.record(latency_ms)
+        if payload is not None:
+            self.payload_bytes = int(payload["bytes"])
+            self.decode_ms = payload["decode_ms"]
+
+    def record_failure(self, latency_ms: float, error: str) -> None:
+        """Record a request that failed."""
+        self.requests += 1
+        self.failures += 1
+        self.last_latency_ms = round(latency_ms, 1)
+        self.latency.record(latency_ms)
+        self.last_error = error
+        self.last_error_time = dt_util.utcnow()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the endpoint metrics for the diagnostics."""
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "last_latency_ms": self.last_latency_ms,
+            "latency": self.latency.as_dict(),
+            "payload_bytes": self.payload_bytes,
+            "decode_ms": self.decode_ms,
+            "last_error": self.last_error,
+            "last_error_time": self.last_error_time,
+        }
+
+
+@dataclass(slots=True)
+class CoordinatorMetrics:
+    """Updates of a coordinator and the requests they made."""
+
+    endpoints: dict[str, EndpointMetrics] = field(default_factory=dict)
+    updates: int = 0
+    update_failures: int = 0
+    update_ms: float | None = None
+    fanout_ms: float | None = None
+    last_error: str | None = None
+    last_error_time: datetime | None = None
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint."""
+        if name not in self.endpoints:
+            self.endpoints[name] = EndpointMetrics()
+        return self.endpoints[name]
+
+    def record_update(self, duration_ms: float) -> None:
+        """Record a completed update, successful or not."""
+        self.updates += 1
+        self.update_ms = round(duration_ms, 1)
+
+    def record_failure(self, error: str) -> None:
+        """Record why an update failed."""
+        self.update_failures += 1
+        self.last_error = error
+        self.last_error_time = dt_util.utcnow()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the coordinator metrics for the diagnostics."""
+        return {
+            "updates": self.updates,
+            "update_failures": self.update_failures,
+            "update_ms": self.update_ms,
+            "fanout_ms": self.fanout_ms,
+            "last_error": self.last_error,
+            "last_error_time": self.last_error_time,
+            "endpoints": {
+                name: endpoint.as_dict() for name, endpoint in self.endpoints.items()
+            },
+        }
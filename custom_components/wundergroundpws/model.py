@@ -0,0 +1,247 @@
+"""Compact data model of the WundergroundPWS API payloads.
+
+Each API response is parsed once into slotted dataclasses holding only the
+fields read by the entities. Observation fields keep the names used by the
+PWS observations API, the forecasts are stored as per-day, per-daypart and
+per-hour column tuples keyed by the forecast API field name.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Final
+
+from .const import (
+    FEATURE_FORECAST,
+    FEATURE_FORECAST_DAYPART,
+    FIELD_DAYPART,
+    FIELD_FORECAST_CALENDARDAYTEMPERATUREMAX,
+    FIELD_FORECAST_CALENDARDAYTEMPERATUREMIN,
+    FIELD_FORECAST_CLOUDCOVER,
+    FIELD_FORECAST_DAYOFWEEK,
+    FIELD_FORECAST_DAYORNIGHT,
+    FIELD_FORECAST_DAYPARTNAME,
+    FIELD_FORECAST_EXPIRATIONTIMEUTC,
+    FIELD_FORECAST_ICONCODE,
+    FIELD_FORECAST_PRECIPCHANCE,
+    FIELD_FORECAST_PRESSUREMEANSEALEVEL,
+    FIELD_FORECAST_QPF,
+    FIELD_FORECAST_RELATIVEHUMIDITY,
+    FIELD_FORECAST_TEMPERATURE,
+    FIELD_FORECAST_TEMPERATUREDEWPOINT,
+    FIELD_FORECAST_TEMPERATUREFEELSLIKE,
+    FIELD_FORECAST_TEMPERATUREMAX,
+    FIELD_FORECAST_TEMPERATUREMIN,
+    FIELD_FORECAST_UVINDEX,
+    FIELD_FORECAST_VALIDTIMEUTC,
+    FIELD_FORECAST_WINDDIRECTION,
+    FIELD_FORECAST_WINDDIRECTIONCARDINAL,
+    FIELD_FORECAST_WINDSPEED,
+    FIELD_OBSERVATIONS,
+)
+from .wupws_forecast_sensors import forecast_sensor_descriptions
+
+# Forecast fields read by the weather entity and the sensor names
+_WEATHER_DAY_FIELDS: Final = (
+    FIELD_FORECAST_CALENDARDAYTEMPERATUREMAX,
+    FIELD_FORECAST_CALENDARDAYTEMPERATUREMIN,
+    FIELD_FORECAST_DAYOFWEEK,
+    FIELD_FORECAST_TEMPERATUREMAX,
+    FIELD_FORECAST_TEMPERATUREMIN,
+    FIELD_FORECAST_VALIDTIMEUTC,
+)
+_WEATHER_DAYPART_FIELDS: Final = (
+    FIELD_FORECAST_DAYORNIGHT,
+    FIELD_FORECAST_DAYPARTNAME,
+    FIELD_FORECAST_ICONCODE,
+    FIELD_FORECAST_PRECIPCHANCE,
+    FIELD_FORECAST_QPF,
+    FIELD_FORECAST_TEMPERATURE,
+    FIELD_FORECAST_WINDDIRECTIONCARDINAL,
+    FIELD_FORECAST_WINDSPEED,
+)
+
+# Forecast columns kept from the payload
+FORECAST_DAY_FIELDS: Final = frozenset(_WEATHER_DAY_FIELDS) | {
+    description.key
+    for description in forecast_sensor_descriptions
+    if description.feature == FEATURE_FORECAST
+}
+FORECAST_DAYPART_FIELDS: Final = frozenset(_WEATHER_DAYPART_FIELDS) | {
+    description.key
+    for description in forecast_sensor_descriptions
+    if description.feature == FEATURE_FORECAST_DAYPART
+}
+# Hourly forecast columns read by the weather entity
+HOURLY_FORECAST_FIELDS: Final = (
+    FIELD_FORECAST_CLOUDCOVER,
+    FIELD_FORECAST_DAYORNIGHT,
+    FIELD_FORECAST_ICONCODE,
+    FIELD_FORECAST_PRECIPCHANCE,
+    FIELD_FORECAST_PRESSUREMEANSEALEVEL,
+    FIELD_FORECAST_QPF,
+    FIELD_FORECAST_RELATIVEHUMIDITY,
+    FIELD_FORECAST_TEMPERATURE,
+    FIELD_FORECAST_TEMPERATUREDEWPOINT,
+    FIELD_FORECAST_TEMPERATUREFEELSLIKE,
+    FIELD_FORECAST_UVINDEX,
+    FIELD_FORECAST_VALIDTIMEUTC,
+    FIELD_FORECAST_WINDDIRECTION,
+    FIELD_FORECAST_WINDSPEED,
+)
+
+
+def forecast_expiration(result_forecast: Mapping[str, Any]) -> float | None:
+    """Return the earliest expirationTimeUtc of a forecast payload."""
+    expirations = [
+        expiration
+        for expiration in result_forecast.get(FIELD_FORECAST_EXPIRATIONTIMEUTC) or []
+        if expiration is not None
+    ]
+    return min(expirations) if expirations else None
+
+
+@dataclass(slots=True, frozen=True)
+class WundergroundPWSObservation:
+    """Current observation of the station.
+
+    Unit-less fields are read from the observation itself, the others from
+    its metric or imperial block.
+    """
+
+    # pylint: disable=invalid-name
+    stationID: str | None = None
+    obsTimeUtc: str | None = None
+    obsTimeLocal: str | None = None
+    neighborhood: str | None = None
+    epoch: int | None = None
+    lat: float | None = None
+    lon: float | None = None
+    humidity: float | None = None
+    winddir: float | None = None
+    solarRadiation: float | None = None
+    uv: float | None = None
+    # unit system dependent
+    temp: float | None = None
+    heatIndex: float | None = None
+    dewpt: float | None = None
+    windChill: float | None = None
+    windSpeed: float | None = None
+    windGust: float | None = None
+    pressure: float | None = None
+    precipRate: float | None = None
+    precipTotal: float | None = None
+    elev: float | None = None
+
+    @classmethod
+    def from_json(
+        cls, result_current: Mapping[str, Any], unit_system: str
+    ) -> WundergroundPWSObservation:
+        """Parse a PWS observations API payload.
+
+        Raises ValueError when the payload holds no observation.
+        """
+        try:
+            observation = result_current[FIELD_OBSERVATIONS][0]
+        except (KeyError, TypeError, IndexError) as err:
+            raise ValueError(f"No observation in payload: {err!r}") from err
+        units = observation.get(unit_system) or {}
+        return cls(
+            **{
+                name: observation[name]
+                for name in _FIELDS
+                if name in observation and name not in _UNIT_FIELDS
+            },
+            **{name: units[name] for name in _UNIT_FIELDS if name in units},
+        )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> WundergroundPWSObservation:
+        """Restore an observation saved with as_dict."""
+        return cls(**{name: data[name] for name in _FIELDS if name in data})
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the observation as a JSON serializable dict."""
+        return asdict(self)
+
+
+_FIELDS: Final = tuple(item.name for item in fields(WundergroundPWSObservation))
+_UNIT_FIELDS: Final = frozenset(_FIELDS[_FIELDS.index("temp") :])
+
+
+@dataclass(slots=True, frozen=True)
+class WundergroundPWSForecast:
+    """Daily forecast, stored as columns indexed by day or by daypart."""
+
+    expires: float | None = None
+    days: Mapping[str, tuple[Any, ...]] = field(default_factory=dict)
+    dayparts: Mapping[str, tuple[Any, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, result_forecast: Mapping[str, Any]) -> WundergroundPWSForecast:
+        """Parse a daily forecast API payload."""
+        try:
+            daypart = result_forecast[FIELD_DAYPART][0] or {}
+        except (KeyError, TypeError, IndexError):
+            daypart = {}
+        return cls(
+            expires=forecast_expiration(result_forecast),
+            days={
+                name: tuple(result_forecast[name])
+                for name in FORECAST_DAY_FIELDS
+                if result_forecast.get(name) is not None
+            },
+            dayparts={
+                name: tuple(daypart[name])
+                for name in FORECAST_DAYPART_FIELDS
+                if daypart.get(name) is not None
+            },
+        )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> WundergroundPWSForecast:
+        """Restore a forecast saved with as_dict."""
+        return cls(
+            expires=data.get("expires"),
+            days={name: tuple(column) for name, column in data["days"].items()},
+            dayparts={name: tuple(column) for name, column in data["dayparts"].items()},
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the forecast as a JSON serializable dict."""
+        return {
+            "expires": self.expires,
+            "days": dict(self.days),
+            "dayparts": dict(self.dayparts),
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class WundergroundPWSHourlyForecast:
+    """Hourly forecast, stored as columns indexed by hour."""
+
+    expires: float | None = None
+    hours: Mapping[str, tuple[Any, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(
+        cls, result_hourly: Mapping[str, Any]
+    ) -> WundergroundPWSHourlyForecast:
+        """Parse an hourly forecast API payload."""
+        return cls(
+            expires=forecast_expiration(result_hourly),
+            hours={
+                name: tuple(result_hourly[name])
+                for name in HOURLY_FORECAST_FIELDS
+                if result_hourly.get(name) is not None
+            },
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class WundergroundPWSData:
+    """Data of the coordinator, read by the entities."""
+
+    observation: WundergroundPWSObservation | None = None
+    forecast: WundergroundPWSForecast | None = None
@@ -0,0 +1,207 @@
+"""The profile_cycle service of WundergroundPWS.
+
+Runs refresh cycles of a loaded config entry under cProfile and, optionally,
+tracemalloc, on the running instance. The cProfile stats and a text report
+with the slowest functions and top allocation sites are written to the
+config directory, a summary is returned as the service response.
+
+cProfile only sees the event loop thread, so responses decoded in the
+executor are missing from the profile; tracemalloc traces every thread.
+Anything else running on the event loop during the cycles is profiled too.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+from pathlib import Path
+import pstats
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any, Final
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import WundergroundPWSUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE_CYCLE: Final = "profile_cycle"
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+ATTR_CYCLES: Final = "cycles"
+ATTR_MEMORY: Final = "memory"
+ATTR_TOP: Final = "top"
+
+# Frames kept per traced allocation
+TRACEMALLOC_FRAMES: Final = 10
+# Entries of the summary returned as the service response
+SUMMARY_SIZE: Final = 10
+
+PROFILE_CYCLE_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=20)
+        ),
+        vol.Optional(ATTR_MEMORY, default=True): cv.boolean,
+        vol.Optional(ATTR_TOP, default=25): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=100)
+        ),
+    }
+)
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the profile_cycle service."""
+
+    async def _async_profile_cycle(call: ServiceCall) -> ServiceResponse:
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if (
+            entry is None
+            or entry.domain != DOMAIN
+            or entry.state is not ConfigEntryState.LOADED
+        ):
+            raise ServiceValidationError(
+                f"{entry_id} is not a loaded {DOMAIN} config entry"
+            )
+        return await async_profile_cycles(
+            hass,
+            hass.data[DOMAIN][entry_id],
+            call.data[ATTR_CYCLES],
+            call.data[ATTR_MEMORY],
+            call.data[ATTR_TOP],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_CYCLE,
+        _async_profile_cycle,
+        schema=PROFILE_CYCLE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_profile_cycles(
+    hass: HomeAssistant,
+    coordinator: WundergroundPWSUpdateCoordinator,
+    cycles: int,
+    memory: bool,
+    top: int,
+) -> dict[str, Any]:
+    """Profile refresh cycles of a coordinator and write the results."""
+    profiler = cProfile.Profile()
+    start_tracing = memory and not tracemalloc.is_tracing()
+    durations: list[float] = []
+    snapshot: tracemalloc.Snapshot | None = None
+    try:
+        profiler.enable()
+    except ValueError as err:
+        raise HomeAssistantError(f"Another profiler is running: {err}") from err
+    if start_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    try:
+        for _ in range(cycles):
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            durations.append(round((time.perf_counter() - start) * 1000, 1))
+    finally:
+        profiler.disable()
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+        if start_tracing:
+            tracemalloc.stop()
+
+    stem = (
+        f"{DOMAIN}_profile_{coordinator.pws_id}_"
+        f"{dt_util.utcnow().strftime('%Y%m%d%H%M%S')}"
+    )
+    summary = await hass.async_add_executor_job(
+        _write_results, Path(hass.config.path(stem)), profiler, snapshot, top
+    )
+    summary = {
+        "pws_id": coordinator.pws_id,
+        "cycles": cycles,
+        "durations_ms": durations,
+        **summary,
+    }
+    _LOGGER.info(
+        "Profiled %s refresh cycles of %s in %s ms, results in %s",
+        cycles,
+        coordinator.pws_id,
+        durations,
+        summary["report"],
+    )
+    return summary
+
+
+def _write_results(
+    path: Path,
+    profiler: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot | None,
+    top: int,
+) -> dict[str, Any]:
+    """Write the stats and the report, return the summary of the service."""
+    profile_path = path.with_suffix(".prof")
+    report_path = path.with_suffix(".txt")
+    profiler.dump_stats(profile_path)
+
+    report = io.StringIO()
+    stats = pstats.Stats(profiler, stream=report)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    functions = []
+    for function in stats.fcn_list[:SUMMARY_SIZE]:
+        _, calls, _, cumulative, _ = stats.stats[function]
+        filename, line, name = function
+        functions.append(
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "cumulative_ms": round(cumulative * 1000, 2),
+            }
+        )
+
+    allocations = []
+    if snapshot is not None:
+        statistics = snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        ).statistics("lineno")
+        report.write(f"\nTop {top} allocation sites\n")
+        for statistic in statistics[:top]:
+            report.write(f"{statistic}\n")
+        allocations = [
+            {
+                "site": str(statistic.traceback[0]),
+                "size_kib": round(statistic.size / 1024, 1),
+                "count": statistic.count,
+            }
+            for statistic in statistics[:SUMMARY_SIZE]
+        ]
+
+    report_path.write_text(report.getvalue(), encoding="utf-8")
+    return {
+        "profile": str(profile_path),
+        "report": str(report_path),
+        "top_functions": functions,
+        "top_allocations": allocations,
+    }
@@ -0,0 +1,221 @@
+"""Local receiver for station uploads in the WU updateweatherstation protocol.
+
+Stations and consoles that upload to Weather Underground with the
+updateweatherstation.php GET protocol can be pointed at Home Assistant
+instead. Uploads are parsed into the observation fields of the PWS
+observations API and pushed straight into the coordinator, without using the
+API key quota. Uploads must carry the upload password set for the station.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+import hmac
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING, Any, Final
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.const import (
+    UnitOfLength,
+    UnitOfPressure,
+    UnitOfSpeed,
+    UnitOfTemperature,
+    UnitOfVolumetricFlux,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import (
+    DistanceConverter,
+    PressureConverter,
+    SpeedConverter,
+    TemperatureConverter,
+)
+
+from .api import async_get_api_client
+from .const import API_METRIC, DATA_PUSH_RECEIVERS, DOMAIN, PUSH_PATH
+
+if TYPE_CHECKING:
+    from .coordinator import WundergroundPWSUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# upload parameter: (observation field, unit converter, imperial unit, metric unit)
+_UNIT_PARAMETERS: Final = {
+    "tempf": (
+        "temp",
+        TemperatureConverter,
+        UnitOfTemperature.FAHRENHEIT,
+        UnitOfTemperature.CELSIUS,
+    ),
+    "dewptf": (
+        "dewpt",
+        TemperatureConverter,
+        UnitOfTemperature.FAHRENHEIT,
+        UnitOfTemperature.CELSIUS,
+    ),
+    "windchillf": (
+        "windChill",
+        TemperatureConverter,
+        UnitOfTemperature.FAHRENHEIT,
+        UnitOfTemperature.CELSIUS,
+    ),
+    "heatindexf": (
+        "heatIndex",
+        TemperatureConverter,
+        UnitOfTemperature.FAHRENHEIT,
+        UnitOfTemperature.CELSIUS,
+    ),
+    "windspeedmph": (
+        "windSpeed",
+        SpeedConverter,
+        UnitOfSpeed.MILES_PER_HOUR,
+        UnitOfSpeed.KILOMETERS_PER_HOUR,
+    ),
+    "windgustmph": (
+        "windGust",
+        SpeedConverter,
+        UnitOfSpeed.MILES_PER_HOUR,
+        UnitOfSpeed.KILOMETERS_PER_HOUR,
+    ),
+    "baromin": (
+        "pressure",
+        PressureConverter,
+        UnitOfPressure.INHG,
+        UnitOfPressure.MBAR,
+    ),
+    "rainin": (
+        "precipRate",
+        SpeedConverter,
+        UnitOfVolumetricFlux.INCHES_PER_HOUR,
+        UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR,
+    ),
+    "dailyrainin": (
+        "precipTotal",
+        DistanceConverter,
+        UnitOfLength.INCHES,
+        UnitOfLength.MILLIMETERS,
+    ),
+}
+
+# upload parameter: observation field, for unit-less values
+_PARAMETERS: Final = {
+    "humidity": "humidity",
+    "winddir": "winddir",
+    "solarradiation": "solarRadiation",
+    "UV": "uv",
+}
+
+
+def parse_station_upload(params: Mapping[str, str], unit_system: str) -> dict[str, Any]:
+    """Parse an upload into observation fields of the PWS observations API.
+
+    Only the fields carried by the upload are returned, the others are kept
+    from the previous observation by the coordinator.
+    """
+    observation: dict[str, Any] = {}
+
+    if (dateutc := params.get("dateutc", "now")) == "now":
+        obs_time = dt_util.utcnow()
+    else:
+        obs_time = datetime.strptime(dateutc, "%Y-%m-%d %H:%M:%S").replace(
+            tzinfo=dt_util.UTC
+        )
+    observation["obsTimeUtc"] = obs_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+    observation["obsTimeLocal"] = dt_util.as_local(obs_time).strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+    observation["epoch"] = int(obs_time.timestamp())
+    observation["stationID"] = params["ID"]
+
+    for parameter, field in _PARAMETERS.items():
+        if (value := _float(params.get(parameter))) is not None:
+            observation[field] = value
+    for parameter, (field, converter, imperial, metric) in _UNIT_PARAMETERS.items():
+        if (value := _float(params.get(parameter))) is None:
+            continue
+        if unit_system == API_METRIC:
+            value = converter.convert(value, imperial, metric)
+        observation[field] = round(value, 2)
+
+    return observation
+
+
+def _float(value: str | None) -> float | None:
+    """Return an upload value as a number, None when missing or invalid."""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    # stations send -9999 for sensors that are not connected
+    return None if number <= -9999 else number
+
+
+def _valid_password(password: str, expected: str) -> bool:
+    """Return if an upload carries the configured password.
+
+    Uploads are rejected while no password is configured, station IDs are
+    public.
+    """
+    return bool(expected) and hmac.compare_digest(
+        password.encode(), expected.encode()
+    )
+
+
+@callback
+def async_register_push_receiver(
+    hass: HomeAssistant, coordinator: WundergroundPWSUpdateCoordinator
+) -> CALLBACK_TYPE:
+    """Route uploads of the coordinator's station to it."""
+    if DATA_PUSH_RECEIVERS not in hass.data:
+        hass.data[DATA_PUSH_RECEIVERS] = {}
+        hass.http.register_view(WundergroundPWSPushView())
+    receivers: dict[str, WundergroundPWSUpdateCoordinator] = hass.data[
+        DATA_PUSH_RECEIVERS
+    ]
+    receivers[coordinator.pws_id] = coordinator
+
+    @callback
+    def _unregister() -> None:
+        if receivers.get(coordinator.pws_id) is coordinator:
+            del receivers[coordinator.pws_id]
+
+    return _unregister
+
+
+class WundergroundPWSPushView(HomeAssistantView):
+    """Receive station uploads in the WU updateweatherstation protocol."""
+
+    url = PUSH_PATH
+    name = "api:wundergroundpws:updateweatherstation"
+    # stations cannot send Home Assistant credentials, uploads are checked
+    # against the upload password configured for the station ID instead
+    requires_auth = False
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Handle a station upload."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        receivers = hass.data.get(DATA_PUSH_RECEIVERS, {})
+        coordinator = receivers.get(request.query.get("ID"))
+        if coordinator is None or not _valid_password(
+            request.query.get("PASSWORD", ""), coordinator.push_password
+        ):
+            return web.Response(
+                status=HTTPStatus.UNAUTHORIZED, text="INVALIDPASSWORDID\n"
+            )
+        try:
+            coordinator.async_push_observation(request.query)
+        except (KeyError, ValueError) as err:
+            _LOGGER.warning("Invalid WUnderground station upload: %s", repr(err))
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text=f"{err}\n")
+        if coordinator.push_forward:
+            hass.async_create_background_task(
+                async_get_api_client(hass).async_forward_upload(request.query_string),
+                f"{DOMAIN} forward {coordinator.pws_id} upload",
+            )
+        return web.Response(text="success\n")
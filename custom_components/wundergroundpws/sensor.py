@@ -30,11 +30,12 @@ from .const import (
     FIELD_FORECAST_DAYOFWEEK,
     FIELD_FORECAST_DAYPARTNAME,
     FIELD_FORECAST_EXPIRED,
-    FIELD_OBSERVATIONS,
     MANUFACTURER,
     MAX_FORECAST_DAYS,
 )
 from .coordinator import WundergroundPWSUpdateCoordinator
+from .model import WundergroundPWSData
+from .wupws_diagnostic_sensors import diagnostic_sensor_descriptions
 from .wupws_forecast_sensors import (
     WundergroundPWSSensorEntityDescription,
     forecast_sensor_descriptions,
@@ -48,6 +49,11 @@ SENSOR_DESCRIPTIONS: tuple[WundergroundPWSSensorEntityDescription, ...] = (
     obs_sensor_descriptions
 )
 
+# Declaration of supported WUpws diagnostic sensors
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: tuple[WundergroundPWSSensorEntityDescription, ...] = (
+    diagnostic_sensor_descriptions
+)
+
 # Declaration of supported WUpws forecast sensors
 FORECAST_SENSOR_DESCRIPTIONS: tuple[WundergroundPWSSensorEntityDescription, ...] = (
     forecast_sensor_descriptions
@@ -63,6 +69,10 @@ async def async_setup_entry(
         WundergroundPWSSensor(coordinator, description)
         for description in SENSOR_DESCRIPTIONS
     ]
+    sensors.extend(
+        WundergroundPWSDiagnosticSensor(coordinator, description)
+        for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS
+    )
 
     if coordinator.forecast_enable:
         sensors.extend(
@@ -137,13 +147,12 @@ class WundergroundPWSSensor(CoordinatorEntity, SensorEntity):
             )
             self.forecast_day = None
         self._unit_system = coordinator.unit_system
-        self._sensor_data = _get_sensor_data(
-            coordinator.data,
-            description.key,
-            self._unit_system,
-            description.feature,
-            forecast_day,
-        )
+        self._data_version = coordinator.data_version(description.feature)
+        self._written_state: tuple[Any, ...] | None = None
+        self._name_tranfile: dict[str, Any] | None = None
+        self._name_part_value: str | None = None
+        self._update_sensor_data()
+        self._update_name()
         # Only set unit of measurement if the sensor has a unit (avoid setting empty string for text sensors)
         if self._sensor_data is not None:
             unit = self.entity_description.unit_fn(
@@ -153,6 +162,16 @@ class WundergroundPWSSensor(CoordinatorEntity, SensorEntity):
                 self._attr_native_unit_of_measurement = unit
         # Note: For text sensors (like narrative/summary), we don't set native_unit_of_measurement at all
 
+    async def async_added_to_hass(self) -> None:
+        """Register the coordinator feature this sensor reads."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.request_feature(
+                self.entity_description.feature or FEATURE_OBSERVATIONS
+            )
+        )
+        self._written_state = self._state_snapshot()
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
@@ -166,41 +185,61 @@ class WundergroundPWSSensor(CoordinatorEntity, SensorEntity):
     @property
     def available(self) -> bool:
         """Return if weather data is available."""
-        return self.coordinator.data is not None
+        return super().available and self.coordinator.data is not None
+
+    def _name_part(self) -> str | None:
+        """Return the forecast value the name of a forecast sensor ends with."""
+        if self.forecast_day is None:
+            return None
+        if self.entity_description.feature == FEATURE_FORECAST_DAYPART:
+            return self.coordinator.get_forecast(
+                FIELD_FORECAST_DAYPARTNAME, self.forecast_day
+            )
+        return self.coordinator.get_forecast(
+            FIELD_FORECAST_DAYOFWEEK, self.forecast_day * 2
+        )
 
-    @property
-    def name(self):
-        """Return the name of the sensor."""
+    def _update_name(self) -> None:
+        """Compute the name of the sensor when the forecast it names changed.
+
+        The name is also rebuilt when the language, and with it the
+        translation table, was changed.
+        """
         tranfile = self.coordinator._tranfile  # noqa: SLF001
+        name_part = self._name_part()
+        if (
+            hasattr(self, "_attr_name")
+            and tranfile is self._name_tranfile
+            and name_part == self._name_part_value
+        ):
+            return
+        self._name_tranfile = tranfile
+        self._name_part_value = name_part
+        self._attr_name = self._build_name(tranfile, name_part)
+
+    def _build_name(
+        self, tranfile: dict[str, Any], name_part: str | None
+    ) -> str | None:
+        """Return the translated name of the sensor."""
         if (
             self.entity_description.key in tranfile
             or self.entity_description.key in tranfile.get(FIELD_DAYPART, {})
         ):
             if self.forecast_day is not None:
                 if self.entity_description.feature == FEATURE_FORECAST_DAYPART:
-                    if (
-                        self.coordinator.data[FIELD_DAYPART][0][
-                            FIELD_FORECAST_DAYPARTNAME
-                        ][self.forecast_day]
-                        is not None
-                    ):
+                    if name_part is not None:
                         return (
                             tranfile[FIELD_DAYPART][self.entity_description.key]
                             + " "
-                            + self.coordinator.data[FIELD_DAYPART][0][
-                                FIELD_FORECAST_DAYPARTNAME
-                            ][self.forecast_day]
+                            + name_part
                         )
                     return (
                         tranfile[FIELD_DAYPART][self.entity_description.key]
                         + " "
                         + tranfile[FIELD_DAYPART][FIELD_FORECAST_EXPIRED]
                     )
-                return (
-                    tranfile[self.entity_description.key]
-                    + " "
-                    + self.coordinator.data[FIELD_FORECAST_DAYOFWEEK][self.forecast_day]
-                )
+                if name_part is not None:
+                    return tranfile[self.entity_description.key] + " " + name_part
             return tranfile[self.entity_description.key]
 
         return self.entity_description.name
@@ -215,22 +254,52 @@ class WundergroundPWSSensor(CoordinatorEntity, SensorEntity):
         """Return the state attributes."""
         return self.entity_description.attr_fn(self.coordinator.data)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle data update."""
+    def _update_sensor_data(self) -> None:
+        """Extract the value of this sensor from the coordinator data."""
         self._sensor_data = _get_sensor_data(
             self.coordinator.data,
             self.entity_description.key,
-            self._unit_system,
             self.entity_description.feature,
+            self.forecast_day,
+        )
+
+    def _state_snapshot(self) -> tuple[Any, ...]:
+        """Return everything written to the state machine for this sensor."""
+        return (
+            self.available,
+            self.native_value,
+            self.extra_state_attributes,
+            self.name,
         )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle data update.
+
+        Extraction is skipped while the data of the sensor's feature did not
+        change, and the state is only written when something in it changed.
+        """
+        version = self.coordinator.data_version(self.entity_description.feature)
+        if (
+            version is not None
+            and version == self._data_version
+            and self._written_state is not None
+            and self.available == self._written_state[0]
+        ):
+            return
+        self._data_version = version
+        self._update_sensor_data()
+        self._update_name()
+        state = self._state_snapshot()
+        if state == self._written_state:
+            return
+        self._written_state = state
         self.async_write_ha_state()
 
 
 def _get_sensor_data(
-    sensors: dict[str, Any],
+    sensors: WundergroundPWSData | None,
     kind: str,
-    unit_system: str,
     feature: str | None = None,
     forecast_day: int | None = None,
 ) -> Any:
@@ -241,17 +310,15 @@ def _get_sensor_data(
         return None
 
     try:
-        if feature == FEATURE_CONDITIONS:
-            return sensors[FIELD_OBSERVATIONS][0][unit_system][kind]
+        if feature in (FEATURE_CONDITIONS, FEATURE_OBSERVATIONS):
+            return getattr(sensors.observation, kind)
         if feature == FEATURE_FORECAST:
-            return sensors[kind][forecast_day]
+            return sensors.forecast.days[kind][forecast_day]
         if feature == FEATURE_FORECAST_DAYPART:
-            return sensors[FIELD_DAYPART][0][kind][forecast_day]
-        if feature == FEATURE_OBSERVATIONS:
-            return sensors[FIELD_OBSERVATIONS][0][kind]
+            return sensors.forecast.dayparts[kind][forecast_day]
         else:
             return sensors
-    except (KeyError, TypeError, IndexError) as e:
+    except (AttributeError, KeyError, TypeError, IndexError) as e:
         # NEW: Exception-Handling
         _LOGGER.debug(
             "Error getting sensor data for %s (feature=%s): %s",
@@ -270,14 +337,10 @@ class WundergroundPWSForecastSensor(WundergroundPWSSensor):
         """Return the state attributes."""
         return self.entity_description.attr_fn(self._sensor_data)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle data update."""
-        self._sensor_data = _get_sensor_data(
-            self.coordinator.data,
-            self.entity_description.key,
-            self._unit_system,
-            self.entity_description.feature,
-            self.forecast_day,
-        )
-        self.async_write_ha_state()
+
+class WundergroundPWSDiagnosticSensor(WundergroundPWSSensor):
+    """Define an WundergroundPWS diagnostic entity."""
+
+    def _update_sensor_data(self) -> None:
+        """Read the value of this sensor from the coordinator diagnostics."""
+        self._sensor_data = self.coordinator.diagnostic_data
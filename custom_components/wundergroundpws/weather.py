@@ -5,14 +5,21 @@ https://github.com/cytech/Home-Assistant-wundergroundpws/tree/v2.X.X
 """
 
 import logging
+from typing import Any, Literal
 
 from homeassistant.components.weather import (
+    ATTR_FORECAST_APPARENT_TEMP,
+    ATTR_FORECAST_CLOUD_COVERAGE,
     ATTR_FORECAST_CONDITION,
+    ATTR_FORECAST_DEW_POINT,
+    ATTR_FORECAST_HUMIDITY,
     ATTR_FORECAST_PRECIPITATION,
     ATTR_FORECAST_PRECIPITATION_PROBABILITY,
+    ATTR_FORECAST_PRESSURE,
     ATTR_FORECAST_TEMP,
     ATTR_FORECAST_TEMP_LOW,
     ATTR_FORECAST_TIME,
+    ATTR_FORECAST_UV_INDEX,
     ATTR_FORECAST_WIND_BEARING,
     ATTR_FORECAST_WIND_SPEED,
     DOMAIN as WEATHER_DOMAIN,
@@ -21,7 +28,7 @@ from homeassistant.components.weather import (
     WeatherEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo, generate_entity_id
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -32,6 +39,10 @@ from . import WundergroundPWSUpdateCoordinator
 from .const import (
     CONF_PWS_ID,
     DOMAIN,
+    FEATURE_CONDITIONS,
+    FEATURE_FORECAST,
+    FEATURE_FORECAST_DAYPART,
+    FEATURE_OBSERVATIONS,
     FIELD_CONDITION_HUMIDITY,
     FIELD_CONDITION_PRESSURE,
     FIELD_CONDITION_TEMP,
@@ -39,12 +50,21 @@ from .const import (
     FIELD_CONDITION_WINDSPEED,
     FIELD_FORECAST_CALENDARDAYTEMPERATUREMAX,
     FIELD_FORECAST_CALENDARDAYTEMPERATUREMIN,
+    FIELD_FORECAST_CLOUDCOVER,
+    FIELD_FORECAST_DAYORNIGHT,
     FIELD_FORECAST_ICONCODE,
     FIELD_FORECAST_PRECIPCHANCE,
+    FIELD_FORECAST_PRESSUREMEANSEALEVEL,
     FIELD_FORECAST_QPF,
+    FIELD_FORECAST_RELATIVEHUMIDITY,
+    FIELD_FORECAST_TEMPERATURE,
+    FIELD_FORECAST_TEMPERATUREDEWPOINT,
+    FIELD_FORECAST_TEMPERATUREFEELSLIKE,
     FIELD_FORECAST_TEMPERATUREMAX,
     FIELD_FORECAST_TEMPERATUREMIN,
+    FIELD_FORECAST_UVINDEX,
     FIELD_FORECAST_VALIDTIMEUTC,
+    FIELD_FORECAST_WINDDIRECTION,
     FIELD_FORECAST_WINDDIRECTIONCARDINAL,
     FIELD_FORECAST_WINDSPEED,
     LENGTHUNIT,
@@ -82,6 +102,48 @@ class WUWeather(CoordinatorEntity, WeatherEntity):
             ENTITY_ID_FORMAT, f"{self._attr_name}", hass=coordinator.hass
         )
         self._attr_unique_id = f"{coordinator.pws_id},{WEATHER_DOMAIN}".lower()
+        self._written_versions: tuple[Any, ...] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Register the coordinator features the weather entity reads."""
+        await super().async_added_to_hass()
+        for feature in (
+            FEATURE_CONDITIONS,
+            FEATURE_OBSERVATIONS,
+            FEATURE_FORECAST,
+            FEATURE_FORECAST_DAYPART,
+        ):
+            self.async_on_remove(self.coordinator.request_feature(feature))
+        self._written_versions = self._data_versions()
+
+    def _data_versions(self) -> tuple[Any, ...]:
+        """Return the availability and versions of the data this entity reads."""
+        return (
+            self.available,
+            self.coordinator.data_version(FEATURE_CONDITIONS),
+            self.coordinator.data_version(FEATURE_FORECAST),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle data update, skipping the state write when nothing changed.
+
+        Daily forecast subscribers are sent the forecast when it changed.
+        Hourly forecast subscribers are sent it once it is due, which fetches
+        it, so it is only requested while someone is subscribed.
+        """
+        versions = self._data_versions()
+        forecast_types: list[Literal["daily", "hourly"]] = []
+        if self._written_versions is None or versions[2] != self._written_versions[2]:
+            forecast_types.append("daily")
+        if self.coordinator.hourly_forecast_due:
+            forecast_types.append("hourly")
+        if forecast_types:
+            self.hass.async_create_task(self.async_update_listeners(forecast_types))
+        if versions == self._written_versions:
+            return
+        self._written_versions = versions
+        self.async_write_ha_state()
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -96,8 +158,9 @@ class WUWeather(CoordinatorEntity, WeatherEntity):
     @property
     def supported_features(self) -> int | None:
         """Flag supported features."""
-        # return WeatherEntityFeature.FORECAST_HOURLY if self.coordinator.config.hourly_forecast else WeatherEntityFeature.FORECAST_DAILY
-        return WeatherEntityFeature.FORECAST_DAILY
+        return (
+            WeatherEntityFeature.FORECAST_DAILY | WeatherEntityFeature.FORECAST_HOURLY
+        )
 
     @property
     def native_temperature(self) -> float:
@@ -165,14 +228,16 @@ class WUWeather(CoordinatorEntity, WeatherEntity):
     @property
     def condition(self) -> str:
         """Return the current condition."""
-        day = self.coordinator.get_forecast(FIELD_FORECAST_ICONCODE)
-        night = self.coordinator.get_forecast(FIELD_FORECAST_ICONCODE, 1)
-        return self.coordinator._iconcode_to_condition(day or night)
+        period = 0 if self.coordinator.get_forecast(FIELD_FORECAST_ICONCODE) else 1
+        return self.coordinator._iconcode_to_condition(
+            self.coordinator.get_forecast(FIELD_FORECAST_ICONCODE, period),
+            self.coordinator.get_forecast(FIELD_FORECAST_DAYORNIGHT, period),
+        )
 
     def _forecast(self) -> list[Forecast]:
         """Return the forecast in native units."""
         days = [0, 2, 4, 6, 8]
-        if self.coordinator.get_forecast("temperature", 0) is None:
+        if self.coordinator.get_forecast(FIELD_FORECAST_TEMPERATURE, 0) is None:
             days[0] += 1
         if self.coordinator._calendarday is True:
             caldaytempmax = FIELD_FORECAST_CALENDARDAYTEMPERATUREMAX
@@ -185,7 +250,10 @@ class WUWeather(CoordinatorEntity, WeatherEntity):
             Forecast(
                 {
                     ATTR_FORECAST_CONDITION: self.coordinator._iconcode_to_condition(
-                        self.coordinator.get_forecast(FIELD_FORECAST_ICONCODE, period)
+                        self.coordinator.get_forecast(FIELD_FORECAST_ICONCODE, period),
+                        self.coordinator.get_forecast(
+                            FIELD_FORECAST_DAYORNIGHT, period
+                        ),
                     ),
                     ATTR_FORECAST_PRECIPITATION: self.coordinator.get_forecast(
                         FIELD_FORECAST_QPF, period
@@ -220,3 +288,72 @@ class WUWeather(CoordinatorEntity, WeatherEntity):
     async def async_forecast_daily(self) -> list[Forecast] | None:
         """Return the daily forecast in native units."""
         return self._forecast()
+
+    async def async_forecast_hourly(self) -> list[Forecast] | None:
+        """Return the hourly forecast in native units, from the current hour."""
+        hourly = await self.coordinator.async_get_hourly_forecast()
+        if hourly is None or FIELD_FORECAST_VALIDTIMEUTC not in hourly.hours:
+            return None
+        hours = hourly.hours
+        start = dt_util.utcnow().timestamp() - 3600
+
+        def _column(field: str) -> tuple[Any, ...]:
+            return hours.get(field) or (None,) * len(hours[FIELD_FORECAST_VALIDTIMEUTC])
+
+        return [
+            Forecast(
+                {
+                    ATTR_FORECAST_CONDITION: self.coordinator._iconcode_to_condition(
+                        icon_code, day_or_night
+                    ),
+                    ATTR_FORECAST_TIME: dt_util.utc_from_timestamp(
+                        valid_time
+                    ).isoformat(),
+                    ATTR_FORECAST_TEMP: temperature,
+                    ATTR_FORECAST_APPARENT_TEMP: feels_like,
+                    ATTR_FORECAST_DEW_POINT: dew_point,
+                    ATTR_FORECAST_HUMIDITY: humidity,
+                    ATTR_FORECAST_PRESSURE: pressure,
+                    ATTR_FORECAST_PRECIPITATION: qpf,
+                    ATTR_FORECAST_PRECIPITATION_PROBABILITY: precip_chance,
+                    ATTR_FORECAST_CLOUD_COVERAGE: cloud_cover,
+                    ATTR_FORECAST_UV_INDEX: uv_index,
+                    ATTR_FORECAST_WIND_BEARING: wind_direction,
+                    ATTR_FORECAST_WIND_SPEED: wind_speed,
+                }
+            )
+            for (
+                valid_time,
+                icon_code,
+                day_or_night,
+                temperature,
+                feels_like,
+                dew_point,
+                humidity,
+                pressure,
+                qpf,
+                precip_chance,
+                cloud_cover,
+                uv_index,
+                wind_direction,
+                wind_speed,
+            ) in zip(
+                hours[FIELD_FORECAST_VALIDTIMEUTC],
+                _column(FIELD_FORECAST_ICONCODE),
+                _column(FIELD_FORECAST_DAYORNIGHT),
+                _column(FIELD_FORECAST_TEMPERATURE),
+                _column(FIELD_FORECAST_TEMPERATUREFEELSLIKE),
+                _column(FIELD_FORECAST_TEMPERATUREDEWPOINT),
+                _column(FIELD_FORECAST_RELATIVEHUMIDITY),
+                _column(FIELD_FORECAST_PRESSUREMEANSEALEVEL),
+                _column(FIELD_FORECAST_QPF),
+                _column(FIELD_FORECAST_PRECIPCHANCE),
+                _column(FIELD_FORECAST_CLOUDCOVER),
+                _column(FIELD_FORECAST_UVINDEX),
+                _column(FIELD_FORECAST_WINDDIRECTION),
+                _column(FIELD_FORECAST_WINDSPEED),
+                strict=False,
+            )
+            # the forecast is kept for a while, skip the hours already past
+            if valid_time > start
+        ]
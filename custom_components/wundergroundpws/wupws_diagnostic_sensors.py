@@ -0,0 +1,146 @@
+"""wundergroundpws diagnostic sensors descriptions."""
+
+from __future__ import annotations
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+
+from .const import FEATURE_DIAGNOSTICS
+from .wupws_obs_sensors import WundergroundPWSSensorEntityDescription
+
+diagnostic_sensor_descriptions = [
+    # api key quota, shared by all entries using the same api key
+    # calls_today: remaining_today: deferred_today:
+    WundergroundPWSSensorEntityDescription(
+        key="calls_today",
+        name="API Calls Today",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:counter",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data, _: data["calls_today"],
+    ),
+    WundergroundPWSSensorEntityDescription(
+        key="remaining_today",
+        name="API Calls Remaining Today",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:gauge",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data, _: data["remaining_today"],
+    ),
+    WundergroundPWSSensorEntityDescription(
+        key="deferred_today",
+        name="API Calls Deferred Today",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:timer-sand",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data, _: data["deferred_today"],
+        entity_registry_enabled_default=False,
+    ),
+    # http cache of the api client, shared by all entries
+    # cache_hits: cache_misses:
+    WundergroundPWSSensorEntityDescription(
+        key="cache_hits",
+        name="API Cache Hits",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:cached",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data, _: data["cache_hits"],
+        entity_registry_enabled_default=False,
+    ),
+    WundergroundPWSSensorEntityDescription(
+        key="cache_misses",
+        name="API Cache Misses",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:cloud-download",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data, _: data["cache_misses"],
+        entity_registry_enabled_default=False,
+    ),
+    # update metrics of the coordinator
+    # update_duration: fanout_duration: observations_latency: forecast_latency:
+    # update_failures: last_error:
+    WundergroundPWSSensorEntityDescription(
+        key="update_duration",
+        name="Update Duration",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        unit_fn=lambda _: UnitOfTime.MILLISECONDS,
+        value_fn=lambda data, _: data["update_duration"],
+        entity_registry_enabled_default=False,
+    ),
+    WundergroundPWSSensorEntityDescription(
+        key="fanout_duration",
+        name="Entity Update Duration",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        unit_fn=lambda _: UnitOfTime.MILLISECONDS,
+        value_fn=lambda data, _: data["fanout_duration"],
+        entity_registry_enabled_default=False,
+    ),
+    WundergroundPWSSensorEntityDescription(
+        key="observations_latency",
+        name="Observations Request Latency",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        unit_fn=lambda _: UnitOfTime.MILLISECONDS,
+        value_fn=lambda data, _: data.get("observations_latency"),
+        entity_registry_enabled_default=False,
+    ),
+    WundergroundPWSSensorEntityDescription(
+        key="forecast_latency",
+        name="Forecast Request Latency",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        unit_fn=lambda _: UnitOfTime.MILLISECONDS,
+        value_fn=lambda data, _: data.get("forecast_latency"),
+        entity_registry_enabled_default=False,
+    ),
+    WundergroundPWSSensorEntityDescription(
+        key="update_failures",
+        name="Update Failures",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:alert-circle-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data, _: data["update_failures"],
+        entity_registry_enabled_default=False,
+    ),
+    WundergroundPWSSensorEntityDescription(
+        key="last_error",
+        name="Last Error",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:alert-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        # states are limited to 255 characters
+        value_fn=lambda data, _: (data["last_error"] or "")[:255] or None,
+        entity_registry_enabled_default=False,
+    ),
+    # coordinator
+    # data_updated:
+    WundergroundPWSSensorEntityDescription(
+        key="data_updated",
+        name="Data Updated",
+        feature=FEATURE_DIAGNOSTICS,
+        icon="mdi:clock-check",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda data, _: data["data_updated"],
+    ),
+]
@@ -143,7 +143,7 @@ obs_sensor_descriptions = [
         icon="mdi:weather-windy",
         unit_fn=lambda _: None,
         value_fn=lambda data, _: degrees_to_cardinal(
-            cast(int, data["observations"][0]["winddir"])
+            cast(int, data.observation.winddir)
         )
         or "",
     ),
@@ -0,0 +1,35 @@
+"""Tests for the wundergroundpws integration."""
+
+from collections.abc import Awaitable, Callable
+import os
+from pathlib import Path
+import socket
+import sys
+
+from aiohttp.test_utils import TestServer
+
+
+def _free_port() -> int:
+    """Return a local TCP port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+ROOT = Path(__file__).resolve().parent.parent
+TOOLS = ROOT / "tools"
+# the API stand-in is a script, not a package
+sys.path.insert(0, str(TOOLS))
+
+# The integration reads the API base URL when it is imported, which pytest
+# only does after importing this package
+STANDIN_PORT = _free_port()
+os.environ["WUNDERGROUNDPWS_API_BASE_URL"] = f"http://127.0.0.1:{STANDIN_PORT}"
+
+API_KEY = "0123456789abcdef"
+PWS_ID = "KCASANFR1234"
+LATITUDE = 37.762
+LONGITUDE = -122.468
+
+# Starts the API stand-in with command line arguments
+StandinFactory = Callable[..., Awaitable[TestServer]]
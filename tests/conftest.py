@@ -0,0 +1,175 @@
+"""Fixtures for the wundergroundpws tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import replace
+from datetime import timedelta
+import json
+from typing import Any
+
+from aiohttp.test_utils import TestServer
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+import wu_standin
+
+from custom_components.wundergroundpws.const import (
+    API_METRIC,
+    API_URL_METRIC,
+    CONF_ADAPTIVE_POLLING,
+    CONF_CALENDARDAYTEMPERATURE,
+    CONF_FORECAST_INTERVAL,
+    CONF_FORECAST_SENSORS,
+    CONF_LANG,
+    CONF_LOCAL_PUSH,
+    CONF_MAX_STALENESS,
+    CONF_NUMERIC_PRECISION,
+    CONF_PUSH_FORWARD,
+    CONF_PUSH_PASSWORD,
+    CONF_PWS_ID,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_CALENDARDAYTEMPERATURE,
+    DEFAULT_FORECAST_INTERVAL,
+    DEFAULT_FORECAST_SENSORS,
+    DEFAULT_LANG,
+    DEFAULT_LOCAL_PUSH,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_NUMERIC_PRECISION,
+    DEFAULT_PUSH_FORWARD,
+    DEFAULT_PUSH_PASSWORD,
+    DOMAIN,
+)
+from custom_components.wundergroundpws.coordinator import (
+    WundergroundPWSUpdateCoordinator,
+    WundergroundPWSUpdateCoordinatorConfig,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+
+from . import API_KEY, LATITUDE, LONGITUDE, PWS_ID, ROOT, STANDIN_PORT, StandinFactory
+
+COORDINATOR_CONFIG = WundergroundPWSUpdateCoordinatorConfig(
+    api_key=API_KEY,
+    pws_id=PWS_ID,
+    numeric_precision=DEFAULT_NUMERIC_PRECISION,
+    unit_system_api=API_URL_METRIC,
+    unit_system=API_METRIC,
+    lang=DEFAULT_LANG,
+    calendarday=False,
+    latitude=LATITUDE,
+    longitude=LONGITUDE,
+    forecast_enable=False,
+    forecast_interval=timedelta(minutes=DEFAULT_FORECAST_INTERVAL),
+    max_staleness=timedelta(minutes=DEFAULT_MAX_STALENESS),
+    adaptive_polling=False,
+    local_push=False,
+    push_forward=False,
+    push_password="",
+    tranfile={},
+)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading the custom integration."""
+
+
+def load_fixture(name: str) -> dict[str, Any]:
+    """Load a payload recorded in tools/fixtures."""
+    return json.loads((wu_standin.FIXTURES / name).read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def observations_payload() -> dict[str, Any]:
+    """Return a PWS current observations payload."""
+    return load_fixture("observations_current.json")
+
+
+@pytest.fixture
+def daily_payload() -> dict[str, Any]:
+    """Return a daily 5 day forecast payload."""
+    return load_fixture("forecast_daily_5day.json")
+
+
+@pytest.fixture
+def hourly_payload() -> dict[str, Any]:
+    """Return an hourly 2 day forecast payload."""
+    return load_fixture("forecast_hourly_2day.json")
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return the config entry of the test station, as created by the config flow."""
+    # the sensor translation files are read from the config directory
+    hass.config.config_dir = str(ROOT)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=PWS_ID,
+        unique_id=f"{DOMAIN}-{PWS_ID}",
+        data={CONF_API_KEY: API_KEY, CONF_PWS_ID: PWS_ID},
+        options={
+            CONF_LATITUDE: LATITUDE,
+            CONF_LONGITUDE: LONGITUDE,
+            CONF_NUMERIC_PRECISION: DEFAULT_NUMERIC_PRECISION,
+            CONF_LANG: DEFAULT_LANG,
+            CONF_CALENDARDAYTEMPERATURE: DEFAULT_CALENDARDAYTEMPERATURE,
+            CONF_FORECAST_SENSORS: DEFAULT_FORECAST_SENSORS,
+            CONF_FORECAST_INTERVAL: DEFAULT_FORECAST_INTERVAL,
+            CONF_MAX_STALENESS: DEFAULT_MAX_STALENESS,
+            CONF_ADAPTIVE_POLLING: DEFAULT_ADAPTIVE_POLLING,
+            CONF_LOCAL_PUSH: DEFAULT_LOCAL_PUSH,
+            CONF_PUSH_FORWARD: DEFAULT_PUSH_FORWARD,
+            CONF_PUSH_PASSWORD: DEFAULT_PUSH_PASSWORD,
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def start_standin() -> AsyncGenerator[StandinFactory]:
+    """Return a function starting the API stand-in with command line arguments.
+
+    The stand-in listens on the API base URL the integration was pointed at.
+    """
+    servers: list[TestServer] = []
+
+    async def _start(*argv: str) -> TestServer:
+        server = TestServer(
+            wu_standin.build_app(wu_standin.parse_args(list(argv))),
+            host="127.0.0.1",
+            port=STANDIN_PORT,
+        )
+        await server.start_server()
+        servers.append(server)
+        return server
+
+    yield _start
+    for server in servers:
+        await server.close()
+
+
+@pytest.fixture
+async def create_coordinator(
+    hass: HomeAssistant,
+) -> AsyncGenerator[Callable[..., WundergroundPWSUpdateCoordinator]]:
+    """Return a function creating a coordinator of the test station.
+
+    Keyword arguments change its configuration. The coordinators are shut
+    down after the test.
+    """
+    coordinators: list[WundergroundPWSUpdateCoordinator] = []
+
+    def _create(
+        config_entry: ConfigEntry | None = None, **changes: Any
+    ) -> WundergroundPWSUpdateCoordinator:
+        coordinator = WundergroundPWSUpdateCoordinator(
+            hass, replace(COORDINATOR_CONFIG, **changes), config_entry
+        )
+        coordinators.append(coordinator)
+        return coordinator
+
+    yield _create
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
@@ -0,0 +1,319 @@
+"""Tests for the wundergroundpws API client."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from email.utils import format_datetime
+
+import aiohttp
+from freezegun.api import FrozenDateTimeFactory
+from multidict import CIMultiDict
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+import wu_standin
+
+from custom_components.wundergroundpws import api
+from custom_components.wundergroundpws.api import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    ApiKeyBudget,
+    CircuitBreaker,
+    CircuitOpen,
+    InvalidApiKey,
+    RequestDeferred,
+    StationOffline,
+    WundergroundPWSApiClient,
+    _max_age,
+    _redact,
+    _retry_after,
+    async_get_api_client,
+)
+from custom_components.wundergroundpws.const import (
+    API_BASE_URL,
+    API_KEY_BURST,
+    API_KEY_CALLS_PER_DAY,
+    BREAKER_FAILURES,
+    BREAKER_RESET,
+    RATE_LIMIT_BACKOFF,
+    STORAGE_SAVE_DELAY,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import API_KEY, PWS_ID, StandinFactory
+
+OBSERVATIONS_URL = (
+    f"{API_BASE_URL}{wu_standin.OBSERVATIONS_PATH}"
+    f"?stationId={PWS_ID}&format=json&units=m&apiKey={API_KEY}"
+)
+
+
+async def test_budget_burst_and_low_priority() -> None:
+    """Test low priority requests are deferred once the burst is used up."""
+    budget = ApiKeyBudget()
+    for _ in range(API_KEY_BURST):
+        await budget.async_acquire(PRIORITY_HIGH)
+    assert budget.calls_today == API_KEY_BURST
+
+    with pytest.raises(RequestDeferred):
+        await budget.async_acquire(PRIORITY_LOW)
+    assert budget.deferred_today == 1
+    assert budget.as_dict() == {
+        "calls_today": API_KEY_BURST,
+        "remaining_today": API_KEY_CALLS_PER_DAY - API_KEY_BURST,
+        "deferred_today": 1,
+    }
+
+
+async def test_budget_pause() -> None:
+    """Test a rate limited API key sends no requests until the pause ends."""
+    budget = ApiKeyBudget()
+    budget.pause(60)
+    with pytest.raises(RequestDeferred, match="rate limited"):
+        await budget.async_acquire(PRIORITY_HIGH)
+    assert budget.calls_today == 0
+
+
+async def test_budget_daily_quota() -> None:
+    """Test requests are deferred once the daily quota is used up."""
+    budget = ApiKeyBudget()
+    budget.calls_today = API_KEY_CALLS_PER_DAY
+    with pytest.raises(RequestDeferred, match="quota exhausted"):
+        await budget.async_acquire(PRIORITY_HIGH)
+    assert budget.remaining_today == 0
+
+
+async def test_budget_daily_reset(freezer: FrozenDateTimeFactory) -> None:
+    """Test the daily counters restart on a new UTC day."""
+    budget = ApiKeyBudget()
+    await budget.async_acquire(PRIORITY_HIGH)
+    freezer.tick(timedelta(days=1))
+    assert budget.remaining_today == API_KEY_CALLS_PER_DAY
+    assert budget.calls_today == 0
+
+
+def test_budget_min_poll_interval() -> None:
+    """Test the daily quota is split over the entries using the key."""
+    budget = ApiKeyBudget()
+    single = budget.min_poll_interval
+    unregister = budget.register()
+    budget.register()
+    assert budget.consumers == 2
+    assert budget.min_poll_interval == pytest.approx(single * 2)
+
+    unregister()
+    unregister()
+    assert budget.consumers == 1
+
+
+async def test_budget_kept_across_restarts(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test today's counters of an API key are continued after a restart."""
+    await start_standin()
+    client = async_get_api_client(hass)
+    await client.async_load_budgets()
+    await client.async_get_json(OBSERVATIONS_URL, API_KEY)
+    client.budget(API_KEY).pause(60)
+    with pytest.raises(RequestDeferred):
+        await client.async_get_json(OBSERVATIONS_URL, API_KEY)
+
+    freezer.tick(timedelta(seconds=STORAGE_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    restarted = WundergroundPWSApiClient(hass)
+    await restarted.async_load_budgets()
+    assert restarted.budget(API_KEY).as_dict() == {
+        "calls_today": 1,
+        "remaining_today": API_KEY_CALLS_PER_DAY - 1,
+        "deferred_today": 1,
+    }
+
+    # counters of an earlier UTC day are not continued
+    freezer.tick(timedelta(days=1))
+    restarted = WundergroundPWSApiClient(hass)
+    await restarted.async_load_budgets()
+    assert restarted.budget(API_KEY).calls_today == 0
+
+
+async def test_malformed_body(
+    hass: HomeAssistant, start_standin: StandinFactory
+) -> None:
+    """Test a truncated body raises ValueError."""
+    await start_standin("--malformed-rate", "1")
+    with pytest.raises(ValueError):
+        await async_get_api_client(hass).async_get_json(OBSERVATIONS_URL, API_KEY)
+
+
+async def test_observations(hass: HomeAssistant, start_standin: StandinFactory) -> None:
+    """Test observations are decoded and revalidated with their ETag."""
+    # no station upload between the requests
+    server = await start_standin("--upload-interval", "86400")
+    client = async_get_api_client(hass)
+
+    result = await client.async_get_json(OBSERVATIONS_URL, API_KEY)
+    assert result["observations"][0]["stationID"] == PWS_ID
+    assert client.payload_stats(OBSERVATIONS_URL)["bytes"] > 0
+
+    # unchanged until the next station upload, the cached payload is reused
+    assert await client.async_get_json(OBSERVATIONS_URL, API_KEY) is result
+    assert client.cache_hits == 1
+    assert dict(server.app[wu_standin.STATS]) == {
+        f"{wu_standin.OBSERVATIONS_PATH} 200": 1,
+        f"{wu_standin.OBSERVATIONS_PATH} 304": 1,
+    }
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({}, 0.0),
+        ({"Cache-Control": "max-age=300"}, 300.0),
+        ({"Cache-Control": 'public, max-age="300"'}, 300.0),
+        ({"Cache-Control": "max-age=300", "Age": "100"}, 200.0),
+        ({"Cache-Control": "max-age=300", "Age": "400"}, 0.0),
+        ({"Cache-Control": "max-age=300", "Age": "soon"}, 300.0),
+        ({"Cache-Control": "max-age=300, no-cache"}, 0.0),
+        ({"Cache-Control": "no-store"}, 0.0),
+        ({"Cache-Control": "max-age=never"}, 0.0),
+    ],
+)
+def test_max_age(headers: dict[str, str], expected: float) -> None:
+    """Test the freshness lifetime read from Cache-Control and Age."""
+    assert _max_age(CIMultiDict(headers)) == expected
+
+
+@pytest.mark.parametrize("status", [500, 503])
+async def test_server_error(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    monkeypatch: pytest.MonkeyPatch,
+    status: int,
+) -> None:
+    """Test server errors are retried before they are raised."""
+    monkeypatch.setattr(api, "RETRY_BACKOFF", 0)
+    server = await start_standin("--error-rate", "1", "--error-codes", str(status))
+    client = async_get_api_client(hass)
+    with pytest.raises(aiohttp.ClientResponseError) as err:
+        await client.async_get_json(OBSERVATIONS_URL, API_KEY)
+    assert err.value.status == status
+    assert dict(server.app[wu_standin.STATS]) == {
+        f"{wu_standin.OBSERVATIONS_PATH} {status}": api.RETRY_ATTEMPTS
+    }
+    assert client.breaker(OBSERVATIONS_URL).failures == api.RETRY_ATTEMPTS
+
+
+def test_circuit_breaker(freezer: FrozenDateTimeFactory) -> None:
+    """Test the breaker opens after repeated failures and probes once."""
+    breaker = CircuitBreaker("api.weather.com")
+    for _ in range(BREAKER_FAILURES - 1):
+        breaker.before_request()
+        breaker.record_failure()
+    assert not breaker.is_open
+
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpen):
+        breaker.before_request()
+
+    # a single probe is let through once the reset time has passed
+    freezer.tick(BREAKER_RESET)
+    breaker.before_request()
+    with pytest.raises(CircuitOpen):
+        breaker.before_request()
+
+    # a failed probe opens the breaker again
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpen):
+        breaker.before_request()
+
+    freezer.tick(BREAKER_RESET)
+    breaker.before_request()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.as_dict() == {"open": False, "half_open": False, "failures": 0}
+    breaker.before_request()
+
+
+def test_circuit_open_is_deferred() -> None:
+    """Test an open breaker is handled like a deferred request."""
+    assert issubclass(CircuitOpen, RequestDeferred)
+
+
+@pytest.mark.parametrize(
+    ("status", "error"),
+    [
+        (401, InvalidApiKey),
+        (204, StationOffline),
+        (429, RequestDeferred),
+    ],
+)
+async def test_error_status(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    status: int,
+    error: type[Exception],
+) -> None:
+    """Test error statuses are classified without retrying or decoding."""
+    server = await start_standin("--error-rate", "1", "--error-codes", str(status))
+    with pytest.raises(error):
+        await async_get_api_client(hass).async_get_json(OBSERVATIONS_URL, API_KEY)
+    assert dict(server.app[wu_standin.STATS]) == {
+        f"{wu_standin.OBSERVATIONS_PATH} {status}": 1
+    }
+
+
+async def test_rate_limited(hass: HomeAssistant, start_standin: StandinFactory) -> None:
+    """Test a 429 pauses the API key for its Retry-After."""
+    server = await start_standin(
+        "--error-rate", "1", "--error-codes", "429", "--retry-after", "120"
+    )
+    client = async_get_api_client(hass)
+    with pytest.raises(RequestDeferred, match="120 s"):
+        await client.async_get_json(OBSERVATIONS_URL, API_KEY)
+
+    # the paused key sends nothing until the Retry-After has passed
+    with pytest.raises(RequestDeferred, match="rate limited"):
+        await client.async_get_json(OBSERVATIONS_URL, API_KEY)
+    assert client.budget(API_KEY).deferred_today == 1
+    assert dict(server.app[wu_standin.STATS]) == {
+        f"{wu_standin.OBSERVATIONS_PATH} 429": 1
+    }
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, RATE_LIMIT_BACKOFF),
+        ("120", 120.0),
+        ("-5", 0.0),
+        ("later", RATE_LIMIT_BACKOFF),
+    ],
+)
+def test_retry_after_seconds(value: str | None, expected: float) -> None:
+    """Test Retry-After given in seconds, missing or invalid."""
+    headers = CIMultiDict() if value is None else CIMultiDict({"Retry-After": value})
+    assert _retry_after(headers) == expected
+
+
+def test_retry_after_date(freezer: FrozenDateTimeFactory) -> None:
+    """Test Retry-After given as an HTTP date."""
+    retry_at = dt_util.utcnow() + timedelta(seconds=90)
+    headers = CIMultiDict({"Retry-After": format_datetime(retry_at, usegmt=True)})
+    assert _retry_after(headers) == pytest.approx(90, abs=1)
+
+    headers = CIMultiDict(
+        {"Retry-After": format_datetime(retry_at - timedelta(hours=1), usegmt=True)}
+    )
+    assert _retry_after(headers) == 0.0
+
+
+def test_redact() -> None:
+    """Test the API key is removed from error messages."""
+    message = "400, url='https://api.weather.com/v2/pws?apiKey=secret&units=m'"
+    assert "secret" not in _redact(message, "secret")
+    assert _redact(message, "") == message
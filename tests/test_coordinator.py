@@ -0,0 +1,307 @@
+"""Tests for the wundergroundpws coordinator."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+import shutil
+import time
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+import wu_standin
+
+from custom_components.wundergroundpws import api
+from custom_components.wundergroundpws.api import async_get_api_client
+from custom_components.wundergroundpws.const import (
+    ADAPTIVE_POLL_GRACE,
+    ADAPTIVE_POLL_MAX,
+    API_IMPERIAL,
+    API_URL_IMPERIAL,
+    FEATURE_FORECAST,
+    FEATURE_OBSERVATIONS,
+    RETRY_ATTEMPTS,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+)
+from custom_components.wundergroundpws.coordinator import (
+    MIN_TIME_BETWEEN_UPDATES,
+    WundergroundPWSUpdateCoordinator,
+)
+from custom_components.wundergroundpws.model import (
+    WundergroundPWSForecast,
+    WundergroundPWSHourlyForecast,
+)
+from homeassistant.core import HomeAssistant
+
+from . import API_KEY, PWS_ID, StandinFactory
+
+CoordinatorFactory = Callable[..., WundergroundPWSUpdateCoordinator]
+
+INTERVAL = 3600
+
+
+async def test_update(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    create_coordinator: CoordinatorFactory,
+) -> None:
+    """Test the observations and the forecast are fetched together."""
+    server = await start_standin()
+    coordinator = create_coordinator()
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data.observation.stationID == PWS_ID
+    assert coordinator.data.forecast.days["dayOfWeek"]
+    assert dict(server.app[wu_standin.STATS]) == {
+        f"{wu_standin.OBSERVATIONS_PATH} 200": 1,
+        f"{wu_standin.FORECAST_PATH} 200": 1,
+    }
+
+
+async def test_update_forecast_failed(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    create_coordinator: CoordinatorFactory,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Test a failed forecast does not discard the observations fetched with it."""
+    monkeypatch.setattr(api, "RETRY_BACKOFF", 0)
+    # the stand-in cannot serve an empty forecast and answers 500
+    shutil.copytree(wu_standin.FIXTURES, tmp_path, dirs_exist_ok=True)
+    (tmp_path / "forecast_daily_5day.json").write_text("{}", encoding="utf-8")
+    server = await start_standin("--fixtures", str(tmp_path))
+    coordinator = create_coordinator()
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data.observation.stationID == PWS_ID
+    assert coordinator.data.forecast is None
+    assert dict(server.app[wu_standin.STATS]) == {
+        f"{wu_standin.OBSERVATIONS_PATH} 200": 1,
+        f"{wu_standin.FORECAST_PATH} 500": RETRY_ATTEMPTS,
+    }
+
+
+async def test_forecast_refreshed_when_expired(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    create_coordinator: CoordinatorFactory,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the forecast is only fetched again once it expired."""
+    server = await start_standin()
+    coordinator = create_coordinator()
+    await coordinator.async_refresh()
+    coordinator.request_feature(FEATURE_OBSERVATIONS)
+    coordinator.request_feature(FEATURE_FORECAST)
+
+    await coordinator.async_refresh()
+    assert dict(server.app[wu_standin.STATS]) == {
+        f"{wu_standin.OBSERVATIONS_PATH} 200": 1,
+        f"{wu_standin.OBSERVATIONS_PATH} 304": 1,
+        f"{wu_standin.FORECAST_PATH} 200": 1,
+    }
+
+    # the stand-in forecast expires within the hour
+    freezer.tick(timedelta(hours=1))
+    await coordinator.async_refresh()
+    assert server.app[wu_standin.STATS][f"{wu_standin.FORECAST_PATH} 200"] == 2
+
+
+async def test_update_skips_unrequested_endpoints(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    create_coordinator: CoordinatorFactory,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test endpoints nothing registered a feature for are not fetched."""
+    server = await start_standin()
+    coordinator = create_coordinator()
+    await coordinator.async_refresh()
+    release = coordinator.request_feature(FEATURE_OBSERVATIONS)
+
+    # the forecast expired, but no entity reads it
+    freezer.tick(timedelta(hours=1))
+    await coordinator.async_refresh()
+    stats = {
+        f"{wu_standin.OBSERVATIONS_PATH} 200": 2,
+        f"{wu_standin.FORECAST_PATH} 200": 1,
+    }
+    assert dict(server.app[wu_standin.STATS]) == stats
+
+    release()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert dict(server.app[wu_standin.STATS]) == stats
+
+
+async def test_update_keeps_last_data(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    create_coordinator: CoordinatorFactory,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test failed updates keep the last data until it is too old."""
+    server = await start_standin("--error-codes", "204")
+    coordinator = create_coordinator(max_staleness=timedelta(minutes=10))
+    await coordinator.async_refresh()
+    coordinator.request_feature(FEATURE_OBSERVATIONS)
+    data, data_updated = coordinator.data, coordinator.data_updated
+
+    # the station goes offline
+    server.app[wu_standin.SETTINGS].error_rate = 1
+    freezer.tick(timedelta(minutes=9))
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data is data
+    assert coordinator.data_updated == data_updated
+
+    freezer.tick(timedelta(minutes=2))
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert server.app[wu_standin.STATS][f"{wu_standin.OBSERVATIONS_PATH} 204"] == 2
+
+
+async def _async_save(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Let the delayed save of the coordinator data run."""
+    freezer.tick(timedelta(seconds=STORAGE_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_restore(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    start_standin: StandinFactory,
+    create_coordinator: CoordinatorFactory,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the data saved after an update is restored at the next start."""
+    await start_standin()
+    coordinator = create_coordinator(config_entry)
+    assert not await coordinator.async_restore()
+    await coordinator.async_refresh()
+    await _async_save(hass, freezer)
+    assert STORAGE_KEY.format(config_entry.entry_id) in hass_storage
+
+    restored = create_coordinator(config_entry)
+    assert await restored.async_restore()
+    assert restored.data == coordinator.data
+    assert restored.data.forecast is not None
+    assert restored.data_updated == coordinator.data_updated
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"pws_id": "KCASANFR9999"},
+        {"lang": "de-DE"},
+        {"unit_system_api": API_URL_IMPERIAL, "unit_system": API_IMPERIAL},
+    ],
+)
+async def test_restore_mismatch(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    create_coordinator: CoordinatorFactory,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+    changes: dict[str, Any],
+) -> None:
+    """Test data saved for another station, language or unit system is dropped."""
+    await start_standin()
+    await create_coordinator(config_entry).async_refresh()
+    await _async_save(hass, freezer)
+
+    restored = create_coordinator(config_entry, **changes)
+    assert not await restored.async_restore()
+    assert restored.data is None
+
+
+async def test_adaptive_polling(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    create_coordinator: CoordinatorFactory,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test polls follow the upload period of the station and back off."""
+    freezer.move_to("2024-06-01 12:00:30+00:00")
+    await start_standin("--upload-interval", "120")
+    coordinator = create_coordinator(adaptive_polling=True)
+    await coordinator.async_refresh()
+    coordinator.request_feature(FEATURE_OBSERVATIONS)
+    # the upload period is not known after a single upload
+    assert coordinator.update_interval == MIN_TIME_BETWEEN_UPDATES
+
+    freezer.tick(timedelta(minutes=2))
+    await coordinator.async_refresh()
+    assert coordinator.upload_period == 120
+    # polled just after the next upload at 12:04:00
+    assert coordinator.update_interval == timedelta(seconds=90 + ADAPTIVE_POLL_GRACE)
+
+    # the station did not upload since the last poll
+    for interval in (210, 420, ADAPTIVE_POLL_MAX):
+        freezer.tick(timedelta(seconds=1))
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=interval)
+
+
+async def test_adaptive_polling_minimum(
+    hass: HomeAssistant,
+    start_standin: StandinFactory,
+    create_coordinator: CoordinatorFactory,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test polls are not closer than the API key quota allows."""
+    freezer.move_to("2024-06-01 12:00:10+00:00")
+    await start_standin("--upload-interval", "30")
+    coordinator = create_coordinator(adaptive_polling=True)
+    await coordinator.async_refresh()
+    coordinator.request_feature(FEATURE_OBSERVATIONS)
+
+    freezer.tick(timedelta(seconds=30))
+    await coordinator.async_refresh()
+    assert coordinator.upload_period == 30
+    assert coordinator.update_interval == timedelta(
+        seconds=async_get_api_client(hass).budget(API_KEY).min_poll_interval
+    )
+
+
+@pytest.mark.parametrize(
+    ("expires_in", "refetch_in"),
+    [
+        # kept until the API expiration
+        (600, 600),
+        # but never longer than the interval
+        (2 * INTERVAL, INTERVAL),
+        # forecasts without, or revalidated past, their expiration are kept
+        # for the interval
+        (None, INTERVAL),
+        (-600, INTERVAL),
+    ],
+)
+@pytest.mark.parametrize(
+    "forecast_class", [WundergroundPWSForecast, WundergroundPWSHourlyForecast]
+)
+def test_forecast_expiration(
+    freezer: FrozenDateTimeFactory,
+    forecast_class: type[WundergroundPWSForecast | WundergroundPWSHourlyForecast],
+    expires_in: float | None,
+    refetch_in: float,
+) -> None:
+    """Test when a forecast is fetched again."""
+    now = time.time()
+    forecast = forecast_class(expires=None if expires_in is None else now + expires_in)
+    assert (
+        WundergroundPWSUpdateCoordinator._forecast_expiration(forecast, INTERVAL)
+        == now + refetch_in
+    )
@@ -0,0 +1,36 @@
+"""Tests for the wundergroundpws diagnostics."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.wundergroundpws.const import CONF_PUSH_PASSWORD
+from custom_components.wundergroundpws.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from . import StandinFactory
+
+REDACTED = "**REDACTED**"
+
+
+async def test_diagnostics_redacted(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    start_standin: StandinFactory,
+) -> None:
+    """Test the API key and the push password are redacted."""
+    await start_standin()
+    hass.config_entries.async_update_entry(
+        config_entry, options={**config_entry.options, CONF_PUSH_PASSWORD: "secret"}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert diagnostics["entry"]["data"][CONF_API_KEY] == REDACTED
+    assert diagnostics["entry"]["options"][CONF_PUSH_PASSWORD] == REDACTED
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,108 @@
+"""Tests for the setup of the wundergroundpws integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+import wu_standin
+
+from custom_components.wundergroundpws.const import (
+    CONF_FORECAST_SENSORS,
+    CONF_LANG,
+    CONF_NUMERIC_PRECISION,
+    DOMAIN,
+    STORAGE_SAVE_DELAY,
+)
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from . import PWS_ID, StandinFactory
+
+
+def _temperature_entity_id(hass: HomeAssistant) -> str:
+    """Return the entity ID of the temperature sensor."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        Platform.SENSOR, DOMAIN, f"{PWS_ID},temp".lower()
+    )
+    assert entity_id is not None
+    return entity_id
+
+
+async def test_setup_restored_offline(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    start_standin: StandinFactory,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test an entry is set up from its saved data while the API is down."""
+    server = await start_standin()
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    temperature = hass.states.get(_temperature_entity_id(hass)).state
+    assert temperature != STATE_UNAVAILABLE
+
+    freezer.tick(timedelta(seconds=STORAGE_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await server.close()
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get(_temperature_entity_id(hass)).state == temperature
+
+    # cancels the background refresh
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+@pytest.mark.parametrize(
+    ("option", "value", "observations", "forecasts"),
+    [
+        (CONF_LANG, "de-DE", 0, 1),
+        (CONF_NUMERIC_PRECISION, "decimal", 1, 0),
+    ],
+)
+async def test_options_applied(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    start_standin: StandinFactory,
+    option: str,
+    value: str,
+    observations: int,
+    forecasts: int,
+) -> None:
+    """Test changed options only fetch the endpoints they affect again."""
+    server = await start_standin()
+    hass.config_entries.async_update_entry(
+        config_entry, options={**config_entry.options, CONF_FORECAST_SENSORS: True}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    stats = server.app[wu_standin.STATS]
+    before = stats.copy()
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={**config_entry.options, option: value}
+    )
+    await hass.async_block_till_done()
+    # applied to the running coordinator, the entry is not reloaded
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert stats - before == {
+        f"{path} 200": count
+        for path, count in (
+            (wu_standin.OBSERVATIONS_PATH, observations),
+            (wu_standin.FORECAST_PATH, forecasts),
+        )
+        if count
+    }
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,106 @@
+"""Tests for the data model of the API payloads."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from custom_components.wundergroundpws.const import API_IMPERIAL, API_METRIC
+from custom_components.wundergroundpws.model import (
+    HOURLY_FORECAST_FIELDS,
+    WundergroundPWSForecast,
+    WundergroundPWSHourlyForecast,
+    WundergroundPWSObservation,
+    forecast_expiration,
+)
+
+from . import PWS_ID
+
+
+@pytest.mark.parametrize(
+    ("unit_system", "temp", "pressure"),
+    [(API_METRIC, 16, 1013.9), (API_IMPERIAL, 61, 29.94)],
+)
+def test_observation(
+    observations_payload: dict[str, Any],
+    unit_system: str,
+    temp: float,
+    pressure: float,
+) -> None:
+    """Test an observation reads the unit block of the unit system."""
+    observation = WundergroundPWSObservation.from_json(
+        observations_payload, unit_system
+    )
+    assert observation.stationID == PWS_ID
+    assert observation.epoch == 1717264500
+    assert observation.lat == 37.762
+    assert observation.humidity == 68.0
+    assert observation.temp == temp
+    assert observation.pressure == pressure
+
+    assert WundergroundPWSObservation.from_dict(observation.as_dict()) == observation
+
+
+def test_observation_missing_unit_block(observations_payload: dict[str, Any]) -> None:
+    """Test fields of a missing unit block are left empty."""
+    del observations_payload["observations"][0]["metric"]
+    observation = WundergroundPWSObservation.from_json(observations_payload, API_METRIC)
+    assert observation.temp is None
+    assert observation.humidity == 68.0
+
+
+@pytest.mark.parametrize(
+    "payload", [{}, {"observations": []}, {"observations": None}, None]
+)
+def test_observation_empty(payload: Any) -> None:
+    """Test a payload without an observation raises ValueError."""
+    with pytest.raises(ValueError):
+        WundergroundPWSObservation.from_json(payload, API_METRIC)
+
+
+def test_forecast(daily_payload: dict[str, Any]) -> None:
+    """Test the daily forecast keeps the columns read by the entities."""
+    forecast = WundergroundPWSForecast.from_json(daily_payload)
+    assert forecast.expires == 1717253400
+    assert forecast.days["validTimeUtc"] == tuple(daily_payload["validTimeUtc"])
+    assert forecast.days["dayOfWeek"][0] == daily_payload["dayOfWeek"][0]
+    assert len(forecast.dayparts["iconCode"]) == len(
+        daily_payload["daypart"][0]["iconCode"]
+    )
+    # columns nothing reads are dropped
+    assert "moonPhase" not in forecast.days
+    assert "sunriseTimeUtc" not in forecast.days
+
+    assert WundergroundPWSForecast.from_dict(forecast.as_dict()) == forecast
+
+
+def test_forecast_without_daypart(daily_payload: dict[str, Any]) -> None:
+    """Test a forecast without dayparts keeps its days."""
+    del daily_payload["daypart"]
+    forecast = WundergroundPWSForecast.from_json(daily_payload)
+    assert forecast.dayparts == {}
+    assert forecast.days["temperatureMax"] == tuple(daily_payload["temperatureMax"])
+
+
+def test_hourly_forecast(hourly_payload: dict[str, Any]) -> None:
+    """Test the hourly forecast keeps the columns of the weather entity."""
+    forecast = WundergroundPWSHourlyForecast.from_json(hourly_payload)
+    assert set(forecast.hours) <= set(HOURLY_FORECAST_FIELDS)
+    assert len(forecast.hours["validTimeUtc"]) == 48
+    assert forecast.expires == min(hourly_payload["expirationTimeUtc"])
+    assert "wxPhraseLong" not in forecast.hours
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        ({}, None),
+        ({"expirationTimeUtc": None}, None),
+        ({"expirationTimeUtc": [None, None]}, None),
+        ({"expirationTimeUtc": [200, None, 100]}, 100),
+    ],
+)
+def test_forecast_expiration(payload: dict[str, Any], expected: float | None) -> None:
+    """Test the earliest expiration of a forecast payload is used."""
+    assert forecast_expiration(payload) == expected
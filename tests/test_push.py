@@ -0,0 +1,85 @@
+"""Tests for the parsing of station uploads."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.wundergroundpws.const import API_IMPERIAL, API_METRIC
+from custom_components.wundergroundpws.push import _valid_password, parse_station_upload
+
+from . import PWS_ID
+
+UPLOAD = {
+    "ID": PWS_ID,
+    "PASSWORD": "secret",
+    "dateutc": "2024-06-01 17:55:00",
+    "tempf": "68",
+    "humidity": "55",
+    "windspeedmph": "10",
+    "winddir": "254",
+    "baromin": "29.92",
+    "rainin": "0.1",
+    "solarradiation": "-9999",
+    "UV": "invalid",
+    "action": "updateraw",
+}
+
+
+def test_parse_upload_imperial() -> None:
+    """Test an upload is parsed into observation fields."""
+    observation = parse_station_upload(UPLOAD, API_IMPERIAL)
+    assert observation["stationID"] == PWS_ID
+    assert observation["obsTimeUtc"] == "2024-06-01T17:55:00Z"
+    assert observation["epoch"] == 1717264500
+    assert observation["temp"] == 68
+    assert observation["humidity"] == 55
+    assert observation["windSpeed"] == 10
+    assert observation["winddir"] == 254
+    assert observation["pressure"] == 29.92
+    assert observation["precipRate"] == 0.1
+    # sensors that are not connected or invalid values are left out
+    assert "solarRadiation" not in observation
+    assert "uv" not in observation
+    assert "dewpt" not in observation
+
+
+def test_parse_upload_metric() -> None:
+    """Test imperial upload values are converted to metric."""
+    observation = parse_station_upload(UPLOAD, API_METRIC)
+    assert observation["temp"] == pytest.approx(20.0)
+    assert observation["windSpeed"] == pytest.approx(16.09, abs=0.01)
+    assert observation["pressure"] == pytest.approx(1013.21, abs=0.01)
+    assert observation["precipRate"] == pytest.approx(2.54)
+    # unit-less values are not converted
+    assert observation["humidity"] == 55
+
+
+def test_parse_upload_now() -> None:
+    """Test uploads without a time are stamped with the current time."""
+    observation = parse_station_upload({"ID": PWS_ID}, API_METRIC)
+    assert observation["epoch"] > 1717264500
+    assert "temp" not in observation
+
+
+def test_parse_upload_invalid() -> None:
+    """Test uploads without a station ID or with an invalid time are rejected."""
+    with pytest.raises(KeyError):
+        parse_station_upload({"tempf": "68"}, API_METRIC)
+    with pytest.raises(ValueError):
+        parse_station_upload({"ID": PWS_ID, "dateutc": "today"}, API_METRIC)
+
+
+@pytest.mark.parametrize(
+    ("password", "expected", "valid"),
+    [
+        ("secret", "secret", True),
+        ("guess", "secret", False),
+        ("", "secret", False),
+        # no upload is accepted until a password is configured
+        ("", "", False),
+        ("secret", "", False),
+    ],
+)
+def test_valid_password(password: str, expected: str, valid: bool) -> None:
+    """Test uploads are only accepted with the configured password."""
+    assert _valid_password(password, expected) is valid
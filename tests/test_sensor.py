@@ -0,0 +1,44 @@
+"""Tests for the wundergroundpws sensors."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.wundergroundpws.const import DOMAIN
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from . import PWS_ID, StandinFactory
+
+
+async def test_state_written_on_change(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    start_standin: StandinFactory,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test sensor states are only written when their data changed."""
+    freezer.move_to("2024-06-01 12:00:00+00:00")
+    # the station does not upload again during the test
+    await start_standin("--upload-interval", "86400")
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    entity_id = er.async_get(hass).async_get_entity_id(
+        Platform.SENSOR, DOMAIN, f"{PWS_ID},temp".lower()
+    )
+    state = hass.states.get(entity_id)
+
+    freezer.tick(timedelta(minutes=1))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).last_reported == state.last_reported
+
+    coordinator.async_push_observation({"ID": PWS_ID, "tempf": "50"})
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "10.0"
+    assert hass.states.get(entity_id).last_updated > state.last_updated
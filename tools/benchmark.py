@@ -0,0 +1,605 @@
+"""Benchmark the update hot path of wundergroundpws.
+
+Runs the integration in a bare Home Assistant core (no http, recorder or
+frontend) against tools/wu_standin.py and measures each update cycle: fetch and
+decode (get_weather), the coordinator fan-out to the entities and their state
+writes. Per cycle it records the wall time, the time the event loop spent
+running callbacks and the longest single callback (loop blocking), and in
+separate tracemalloc passes the peak memory allocated and the blocks still
+held after the cycle. Micro benchmarks time _get_sensor_data over every sensor
+description, WUWeather._forecast and async_write_ha_state of every entity.
+
+Each scenario sets up a fresh core with 1 to N config entries, with the
+forecast sensors on or off. The API key limits are lifted, requests the
+budgets still deferred or held back are reported with each cycle. Results are written as JSON; pass a previous
+results file as --baseline to list the metrics that regressed:
+
+    python tools/benchmark.py --entries 1,10,50 --output bench-2.3.0.json
+    python tools/benchmark.py --baseline bench-2.3.0.json --output bench.json
+
+Requires Home Assistant to be installed in the running environment.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+import json
+import logging
+import os
+from pathlib import Path
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+STANDIN = Path(__file__).resolve().parent / "wu_standin.py"
+MANIFEST = ROOT / "custom_components" / "wundergroundpws" / "manifest.json"
+
+_LOGGER = logging.getLogger("benchmark")
+
+# Requests waiting longer than this for a budget token count as throttled
+BUDGET_WAIT = 0.001
+
+
+class LoopMonitor:
+    """Time every callback the event loop runs while the monitor is active.
+
+    The busy time is how long the loop could not serve anything else, the
+    longest callback is the worst blocking seen.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.busy = 0.0
+        self.longest = 0.0
+        self.callbacks = 0
+        self._original: Callable[[asyncio.Handle], None] | None = None
+
+    def __enter__(self) -> LoopMonitor:
+        """Start timing callbacks."""
+        monitor = self
+        original = self._original = asyncio.Handle._run  # noqa: SLF001
+
+        def _run(handle: asyncio.Handle) -> None:
+            start = time.perf_counter()
+            try:
+                original(handle)
+            finally:
+                elapsed = time.perf_counter() - start
+                monitor.busy += elapsed
+                monitor.longest = max(monitor.longest, elapsed)
+                monitor.callbacks += 1
+
+        asyncio.Handle._run = _run  # noqa: SLF001
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop timing callbacks."""
+        asyncio.Handle._run = self._original  # noqa: SLF001
+
+
+class BudgetMonitor:
+    """Count the requests the API key budgets deferred or made wait.
+
+    The limits are lifted for the benchmark, so any deferred or throttled
+    request means the cycles measured the governor instead of the hot path.
+    """
+
+    def __init__(self, budgets: list[Any]) -> None:
+        """Initialize."""
+        self.budgets = budgets
+        self.throttled = 0
+        self.wait = 0.0
+        for budget in budgets:
+            self._watch(budget)
+
+    def _watch(self, budget: Any) -> None:
+        """Time the token waits of a budget."""
+        monitor = self
+        acquire = budget.async_acquire
+
+        async def _async_acquire(priority: int) -> None:
+            start = time.perf_counter()
+            try:
+                await acquire(priority)
+            finally:
+                if (elapsed := time.perf_counter() - start) > BUDGET_WAIT:
+                    monitor.throttled += 1
+                    monitor.wait += elapsed
+
+        budget.async_acquire = _async_acquire
+
+    @property
+    def deferred(self) -> int:
+        """Return the requests deferred by the budgets."""
+        return sum(budget.deferred_today for budget in self.budgets)
+
+    def counts(self) -> tuple[int, int, float]:
+        """Return the deferred and throttled requests and the time waited."""
+        return self.deferred, self.throttled, self.wait
+
+
+def lift_budget_limits() -> None:
+    """Lift the API key limits of the integration.
+
+    Every entry polls with its own key, at the cycle interval the real limits
+    would space out observations and defer forecasts after a few cycles.
+    """
+    from custom_components.wundergroundpws import api  # noqa: PLC0415
+
+    api.API_KEY_CALLS_PER_MINUTE = 10**9
+    api.API_KEY_CALLS_PER_DAY = 10**12
+    api.API_KEY_BURST = 10**9
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    """Return the median, 95th percentile and maximum of a metric."""
+    if not values:
+        return {}
+    p95 = statistics.quantiles(values, n=20)[-1] if len(values) > 1 else values[0]
+    return {"median": statistics.median(values), "p95": p95, "max": max(values)}
+
+
+def _time_ns(function: Callable[[], Any], repeat: int) -> float:
+    """Return the mean duration of a call, in nanoseconds."""
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter_ns() - start) / repeat
+
+
+def _free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_standin(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    """Start the API stand-in in its own process and return its base URL."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(STANDIN),
+            "--port",
+            str(port),
+            "--latency",
+            str(args.latency),
+            "--upload-interval",
+            str(max(int(args.interval), 1)),
+            "--seed",
+            "0",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError("The API stand-in did not start") from None
+            time.sleep(0.1)
+    return process, f"http://127.0.0.1:{port}"
+
+
+async def async_start_hass(config_dir: str):
+    """Return a bare Home Assistant core with its registries loaded."""
+    from homeassistant.core import CoreState, HomeAssistant  # noqa: PLC0415
+    from homeassistant.helpers import (  # noqa: PLC0415
+        area_registry as ar,
+        device_registry as dr,
+        entity_registry as er,
+        floor_registry as fr,
+        label_registry as lr,
+    )
+    from homeassistant.util.unit_system import METRIC_SYSTEM  # noqa: PLC0415
+
+    hass = HomeAssistant(config_dir)
+    hass.config.units = METRIC_SYSTEM
+    for registry in (ar, fr, lr, dr, er):
+        await registry.async_load(hass)
+    hass.set_state(CoreState.running)
+    return hass
+
+
+async def async_setup_entries(
+    hass, entries: int, forecast: bool
+) -> tuple[list[Any], list[Any], list[Any]]:
+    """Set up coordinators and entities the way the config entries would.
+
+    Every entry gets its own station, geocode and API key, so the entries do
+    not share forecasts or a request budget.
+    """
+    from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: PLC0415
+
+    from custom_components.wundergroundpws import _load_tranfile  # noqa: PLC0415
+    from custom_components.wundergroundpws import sensor, weather  # noqa: PLC0415
+    from custom_components.wundergroundpws.const import (  # noqa: PLC0415
+        API_METRIC,
+        API_URL_METRIC,
+        CONF_PWS_ID,
+        DEFAULT_FORECAST_INTERVAL,
+        DEFAULT_MAX_STALENESS,
+        DOMAIN,
+    )
+    from custom_components.wundergroundpws.coordinator import (  # noqa: PLC0415
+        WundergroundPWSUpdateCoordinator,
+        WundergroundPWSUpdateCoordinatorConfig,
+    )
+
+    tranfile = await hass.async_add_executor_job(_load_tranfile, str(ROOT), "en")
+    hass.data.setdefault(DOMAIN, {})
+    platforms = {
+        domain: EntityPlatform(
+            hass=hass,
+            logger=_LOGGER,
+            domain=domain,
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        for domain in ("sensor", "weather")
+    }
+    coordinators = []
+    sensors: list[Any] = []
+    weathers: list[Any] = []
+    for index in range(entries):
+        config = WundergroundPWSUpdateCoordinatorConfig(
+            api_key=f"benchmark{index:04d}",
+            pws_id=f"KBENCH{index:04d}",
+            numeric_precision="decimal",
+            unit_system_api=API_URL_METRIC,
+            unit_system=API_METRIC,
+            lang="en-US",
+            calendarday=False,
+            latitude=str(round(30 + index * 0.1, 2)),
+            longitude=str(round(-120 + index * 0.1, 2)),
+            forecast_enable=forecast,
+            forecast_interval=timedelta(minutes=DEFAULT_FORECAST_INTERVAL),
+            max_staleness=timedelta(minutes=DEFAULT_MAX_STALENESS),
+            adaptive_polling=False,
+            local_push=False,
+            push_forward=False,
+            push_password="",
+            tranfile=tranfile,
+        )
+        coordinator = WundergroundPWSUpdateCoordinator(hass, config)
+        entry = SimpleNamespace(
+            entry_id=f"benchmark{index:04d}", data={CONF_PWS_ID: config.pws_id}
+        )
+        hass.data[DOMAIN][entry.entry_id] = coordinator
+        coordinators.append(coordinator)
+        await sensor.async_setup_entry(hass, entry, sensors.extend)
+        await weather.async_setup_entry(hass, entry, weathers.extend)
+    await platforms["sensor"].async_add_entities(sensors)
+    await platforms["weather"].async_add_entities(weathers)
+    return coordinators, sensors, weathers
+
+
+async def async_cycle(
+    coordinators: list[Any], budgets: BudgetMonitor
+) -> dict[str, float]:
+    """Run one update of every entry and time its parts."""
+
+    async def _update(coordinator) -> tuple[float, float]:
+        start = time.perf_counter()
+        data = await coordinator.get_weather()
+        fetched = time.perf_counter()
+        # fan-out: listeners extract their values and write their states
+        coordinator.async_set_updated_data(data)
+        return fetched - start, time.perf_counter() - fetched
+
+    deferred, throttled, wait = budgets.counts()
+    with LoopMonitor() as monitor:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(_update(item) for item in coordinators))
+        wall = time.perf_counter() - start
+    return {
+        "deferred_requests": budgets.deferred - deferred,
+        "throttled_requests": budgets.throttled - throttled,
+        "throttle_wait_ms": (budgets.wait - wait) * 1000,
+        "wall_ms": wall * 1000,
+        "get_weather_ms": statistics.median(item[0] for item in results) * 1000,
+        "fanout_ms": sum(item[1] for item in results) * 1000,
+        "loop_busy_ms": monitor.busy * 1000,
+        "loop_max_block_ms": monitor.longest * 1000,
+        "callbacks": monitor.callbacks,
+    }
+
+
+async def async_memory_cycle(
+    coordinators: list[Any], budgets: BudgetMonitor
+) -> dict[str, float]:
+    """Run one update of every entry under tracemalloc."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        await async_cycle(coordinators, budgets)
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "peak_kib": (peak - before) / 1024,
+            "retained_kib": (current - before) / 1024,
+            "net_blocks": sys.getallocatedblocks() - blocks,
+        }
+    finally:
+        tracemalloc.stop()
+
+
+def micro_benchmarks(
+    coordinator, sensors: list[Any], weathers: list[Any], repeat: int
+) -> dict[str, float]:
+    """Time the per-entity work of the fan-out, outside of an update."""
+    from custom_components.wundergroundpws.const import (  # noqa: PLC0415
+        FEATURE_FORECAST_DAYPART,
+        MAX_FORECAST_DAYS,
+    )
+    from custom_components.wundergroundpws.sensor import (  # noqa: PLC0415
+        FORECAST_SENSOR_DESCRIPTIONS,
+        SENSOR_DESCRIPTIONS,
+        _get_sensor_data,
+    )
+
+    data = coordinator.data
+    calls = [
+        (description.key, description.feature, None)
+        for description in SENSOR_DESCRIPTIONS
+    ] + [
+        (description.key, description.feature, day)
+        for description in FORECAST_SENSOR_DESCRIPTIONS
+        for day in range(
+            MAX_FORECAST_DAYS
+            * (2 if description.feature == FEATURE_FORECAST_DAYPART else 1)
+        )
+    ]
+
+    def _sweep() -> None:
+        for kind, feature, day in calls:
+            _get_sensor_data(data, kind, feature, day)
+
+    def _write_states() -> None:
+        for entity in entities:
+            entity.async_write_ha_state()
+
+    entities = [*sensors, *weathers]
+    return {
+        "get_sensor_data_ns": _time_ns(_sweep, repeat) / len(calls),
+        "weather_forecast_ns": _time_ns(weathers[0]._forecast, repeat),  # noqa: SLF001
+        "write_state_ns": _time_ns(_write_states, max(repeat // 100, 1))
+        / len(entities),
+    }
+
+
+async def async_run_scenario(
+    args: argparse.Namespace, entries: int, forecast: bool
+) -> dict[str, Any]:
+    """Benchmark one number of entries with the forecast sensors on or off."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        try:
+            coordinators, sensors, weathers = await async_setup_entries(
+                hass, entries, forecast
+            )
+            budgets = BudgetMonitor(
+                [
+                    item._client.budget(item._api_key)  # noqa: SLF001
+                    for item in coordinators
+                ]
+            )
+            cold = await async_cycle(coordinators, budgets)
+            cycles = []
+            for _ in range(args.cycles):
+                await asyncio.sleep(args.interval)
+                if args.refetch_forecast:
+                    for coordinator in coordinators:
+                        coordinator._forecast_expires = 0.0  # noqa: SLF001
+                cycles.append(await async_cycle(coordinators, budgets))
+            memory = []
+            for _ in range(args.memory_cycles):
+                await asyncio.sleep(args.interval)
+                memory.append(await async_memory_cycle(coordinators, budgets))
+            micro = micro_benchmarks(coordinators[0], sensors, weathers, args.repeat)
+        finally:
+            await hass.async_stop(force=True)
+
+    def _median(items: list[dict[str, float]], key: str) -> float | None:
+        return _summary([item[key] for item in items]).get("median")
+
+    return {
+        "entries": entries,
+        "forecast_sensors": forecast,
+        "entities": len(sensors) + len(weathers),
+        "metrics": {
+            "cold_wall_ms": cold["wall_ms"],
+            "wall_ms": _median(cycles, "wall_ms"),
+            "get_weather_ms": _median(cycles, "get_weather_ms"),
+            "fanout_ms": _median(cycles, "fanout_ms"),
+            "loop_busy_ms": _median(cycles, "loop_busy_ms"),
+            "loop_max_block_ms": max(
+                (item["loop_max_block_ms"] for item in cycles), default=None
+            ),
+            "peak_kib": _median(memory, "peak_kib"),
+            "retained_kib": _median(memory, "retained_kib"),
+            **micro,
+        },
+        "budget": {
+            "deferred_requests": budgets.deferred,
+            "throttled_requests": budgets.throttled,
+            "throttle_wait_ms": budgets.wait * 1000,
+        },
+        "summary": {
+            key: _summary([item[key] for item in cycles])
+            for key in ("wall_ms", "fanout_ms", "loop_busy_ms", "loop_max_block_ms")
+        },
+        "cold": cold,
+        "cycles": cycles,
+        "memory": memory,
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """Return the metrics that grew by more than threshold since the baseline."""
+    regressions = []
+    for key, scenario in results["scenarios"].items():
+        if (previous := baseline.get("scenarios", {}).get(key)) is None:
+            continue
+        for metric, value in scenario["metrics"].items():
+            old = previous["metrics"].get(metric)
+            if value is None or not old or old <= 0:
+                continue
+            if value > old * (1 + threshold):
+                regressions.append(
+                    f"{key} {metric}: {old:.3f} -> {value:.3f} "
+                    f"(+{(value / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _metadata(args: argparse.Namespace) -> dict[str, Any]:
+    """Return what the results were measured with."""
+    from homeassistant.const import __version__ as ha_version  # noqa: PLC0415
+
+    try:
+        revision = subprocess.run(
+            ["git", "-C", str(ROOT), "describe", "--always", "--dirty"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "created": datetime.now(UTC).isoformat(),
+        "integration": json.loads(MANIFEST.read_text(encoding="utf-8"))["version"],
+        "revision": revision,
+        "homeassistant": ha_version,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "arguments": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+        },
+    }
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    """Run every scenario, write the results and compare with the baseline."""
+    process, base_url = start_standin(args)
+    # read by the integration's const module when it is imported
+    os.environ["WUNDERGROUNDPWS_API_BASE_URL"] = base_url
+    sys.path.insert(0, str(ROOT))
+    lift_budget_limits()
+    try:
+        results: dict[str, Any] = {"meta": _metadata(args), "scenarios": {}}
+        for forecast in args.forecast:
+            for entries in args.entries:
+                key = f"{entries}-{'forecast' if forecast else 'noforecast'}"
+                _LOGGER.info("Running scenario %s", key)
+                scenario = await async_run_scenario(args, entries, forecast)
+                results["scenarios"][key] = scenario
+                _LOGGER.info(
+                    "%s: %s",
+                    key,
+                    ", ".join(
+                        f"{metric}={value:.3f}"
+                        for metric, value in scenario["metrics"].items()
+                        if value is not None
+                    ),
+                )
+                if any(scenario["budget"].values()):
+                    _LOGGER.warning(
+                        "%s: the API key budgets deferred or throttled requests, "
+                        "the timings include the governor: %s",
+                        key,
+                        scenario["budget"],
+                    )
+    finally:
+        process.terminate()
+        process.wait()
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)  # noqa: T201
+
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        _LOGGER.warning("Regression %s", regression)
+    return 1 if regressions else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "--entries",
+        type=lambda value: [int(item) for item in value.split(",")],
+        default=[1, 10, 50],
+        help="comma separated numbers of config entries",
+    )
+    parser.add_argument(
+        "--forecast",
+        type=lambda value: [item == "on" for item in value.split(",")],
+        default=[False, True],
+        help="forecast sensors: on, off or off,on",
+    )
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--memory-cycles", type=int, default=3)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="seconds between cycles, also the station upload interval",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="API stand-in latency, seconds"
+    )
+    parser.add_argument(
+        "--refetch-forecast",
+        action="store_true",
+        help="fetch the forecast on every cycle instead of when it expires",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10000, help="iterations of micro benchmarks"
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative growth reported as a regression",
+    )
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(async_main(parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Offline stand-in for the api.weather.com endpoints used by wundergroundpws.
+
+Serves the PWS current observations, the daily 5 day and the hourly 2 day
+forecasts from the recorded payloads in tools/fixtures, with their time fields moved to the
+present. Latency, error responses, malformed bodies and the upload cadence of
+the station are configurable, so the integration can be exercised under load
+and failure without using API quota.
+
+Start the stand-in and point Home Assistant at it:
+
+    python tools/wu_standin.py --port 8089 --error-rate 0.1
+    WUNDERGROUNDPWS_API_BASE_URL=http://127.0.0.1:8089 hass -c config
+
+GET /standin/stats returns the number of responses sent per path and status.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+import copy
+from datetime import UTC, datetime
+import hashlib
+import json
+import logging
+import math
+from pathlib import Path
+import random
+import time
+from typing import Any
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).parent / "fixtures"
+OBSERVATIONS_PATH = "/v2/pws/observations/current"
+FORECAST_PATH = "/v3/wx/forecast/daily/5day"
+HOURLY_PATH = "/v3/wx/forecast/hourly/2day"
+STATS_PATH = "/standin/stats"
+
+# units query parameter -> unit block of the observation
+UNIT_BLOCKS = {"e": "imperial", "m": "metric", "h": "uk_hybrid", "s": "metric"}
+# forecast payloads are refreshed by TWC about every hour
+FORECAST_TTL = 3600
+
+STATS = web.AppKey("stats", Counter)
+SETTINGS = web.AppKey("settings", argparse.Namespace)
+
+
+def load_fixture(directory: Path, name: str) -> dict[str, Any]:
+    """Load a recorded payload."""
+    return json.loads((directory / name).read_text(encoding="utf-8"))
+
+
+def current_observation(
+    fixture: dict[str, Any], station_id: str, units: str, upload_interval: int
+) -> dict[str, Any]:
+    """Return the observation of the last station upload.
+
+    The station uploads every upload_interval seconds, each upload moves the
+    temperature, wind and pressure a little.
+    """
+    payload = copy.deepcopy(fixture)
+    observation = payload["observations"][0]
+    now = int(time.time())
+    epoch = now - now % upload_interval
+    obs_time = datetime.fromtimestamp(epoch, UTC)
+    observation.update(
+        stationID=station_id,
+        epoch=epoch,
+        obsTimeUtc=obs_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        obsTimeLocal=obs_time.astimezone().strftime("%Y-%m-%d %H:%M:%S"),
+        winddir=(observation["winddir"] + epoch // upload_interval * 7) % 360,
+    )
+    block = UNIT_BLOCKS.get(units, "metric")
+    values = dict(observation.get(block) or observation["metric"])
+    for field, amplitude in (("temp", 2), ("windSpeed", 4), ("pressure", 1)):
+        values[field] = round(values[field] + amplitude * math.sin(epoch / 3600), 1)
+    for name in set(UNIT_BLOCKS.values()):
+        observation.pop(name, None)
+    observation[block] = values
+    return payload
+
+
+def daily_forecast(fixture: dict[str, Any]) -> dict[str, Any]:
+    """Return the forecast with its days starting today.
+
+    The payload changes, and expires, once per FORECAST_TTL like the API.
+    """
+    payload = copy.deepcopy(fixture)
+    now = int(time.time())
+    issued = now - now % FORECAST_TTL
+    # days of the fixture start at 07:00 local time, local midnight is 7 h
+    # earlier, so the forecast rolls over to the next day at midnight
+    midnight = payload["validTimeUtc"][0] - 7 * 3600
+    shift = (issued - midnight) // 86400 * 86400
+    for field in (
+        "validTimeUtc",
+        "sunriseTimeUtc",
+        "sunsetTimeUtc",
+        "moonriseTimeUtc",
+        "moonsetTimeUtc",
+    ):
+        payload[field] = [value + shift for value in payload[field]]
+    payload["expirationTimeUtc"] = [issued + FORECAST_TTL] * len(
+        payload["validTimeUtc"]
+    )
+    payload["dayOfWeek"] = [
+        datetime.fromtimestamp(value, UTC).strftime("%A")
+        for value in payload["validTimeUtc"]
+    ]
+    return payload
+
+
+def hourly_forecast(fixture: dict[str, Any]) -> dict[str, Any]:
+    """Return the hourly forecast starting at the current hour."""
+    payload = copy.deepcopy(fixture)
+    now = int(time.time())
+    issued = now - now % 3600
+    shift = issued - payload["validTimeUtc"][0]
+    payload["validTimeUtc"] = [value + shift for value in payload["validTimeUtc"]]
+    payload["validTimeLocal"] = [
+        datetime.fromtimestamp(value, UTC).strftime("%Y-%m-%dT%H:%M:%S%z")
+        for value in payload["validTimeUtc"]
+    ]
+    payload["dayOfWeek"] = [
+        datetime.fromtimestamp(value, UTC).strftime("%A")
+        for value in payload["validTimeUtc"]
+    ]
+    payload["expirationTimeUtc"] = [issued + FORECAST_TTL] * len(
+        payload["validTimeUtc"]
+    )
+    return payload
+
+
+async def handle_api(request: web.Request) -> web.StreamResponse:
+    """Serve one API request."""
+    settings = request.app[SETTINGS]
+    response = await _api_response(request, settings)
+    request.app[STATS][f"{request.path} {response.status}"] += 1
+    return response
+
+
+async def _api_response(
+    request: web.Request, settings: argparse.Namespace
+) -> web.StreamResponse:
+    """Build the response to an API request, simulating the configured faults."""
+    if settings.latency or settings.jitter:
+        await asyncio.sleep(
+            max(settings.latency + random.uniform(-1, 1) * settings.jitter, 0)
+        )
+
+    if settings.api_key and request.query.get("apiKey") != settings.api_key:
+        return web.Response(status=401)
+    if random.random() < settings.error_rate:
+        status = random.choice(settings.error_codes)
+        headers = {"Retry-After": str(settings.retry_after)} if status == 429 else {}
+        return web.Response(status=status, headers=headers)
+    if random.random() < settings.malformed_rate:
+        return web.Response(
+            body=b'{"observations": [{"stationID": ', content_type="application/json"
+        )
+
+    if request.path == OBSERVATIONS_PATH:
+        payload = current_observation(
+            request.app["observations"],
+            request.query.get("stationId", ""),
+            request.query.get("units", "m"),
+            settings.upload_interval,
+        )
+    elif request.path == HOURLY_PATH:
+        payload = hourly_forecast(request.app["hourly"])
+    else:
+        payload = daily_forecast(request.app["forecast"])
+    body = json.dumps(payload).encode()
+
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"max-age={settings.max_age}"}
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=body, content_type="application/json", headers=headers)
+
+
+async def handle_stats(request: web.Request) -> web.Response:
+    """Return the responses sent per path and status."""
+    return web.json_response(dict(request.app[STATS]))
+
+
+def build_app(settings: argparse.Namespace) -> web.Application:
+    """Build the stand-in application."""
+    app = web.Application()
+    app[SETTINGS] = settings
+    app[STATS] = Counter()
+    app["observations"] = load_fixture(settings.fixtures, "observations_current.json")
+    app["forecast"] = load_fixture(settings.fixtures, "forecast_daily_5day.json")
+    app["hourly"] = load_fixture(settings.fixtures, "forecast_hourly_2day.json")
+    app.router.add_get(OBSERVATIONS_PATH, handle_api)
+    app.router.add_get(FORECAST_PATH, handle_api)
+    app.router.add_get(HOURLY_PATH, handle_api)
+    app.router.add_get(STATS_PATH, handle_stats)
+    return app
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="mean response delay, seconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="random +/- delay, seconds"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="share of error responses"
+    )
+    parser.add_argument(
+        "--error-codes",
+        type=lambda value: [int(code) for code in value.split(",")],
+        default=[401, 204, 429, 500, 503],
+        help="comma separated statuses the errors are drawn from",
+    )
+    parser.add_argument(
+        "--retry-after", type=int, default=60, help="Retry-After of 429, seconds"
+    )
+    parser.add_argument(
+        "--malformed-rate",
+        type=float,
+        default=0.0,
+        help="share of truncated JSON bodies",
+    )
+    parser.add_argument(
+        "--upload-interval",
+        type=int,
+        default=300,
+        help="seconds between station uploads",
+    )
+    parser.add_argument(
+        "--max-age", type=int, default=0, help="Cache-Control max-age, seconds"
+    )
+    parser.add_argument(
+        "--api-key", default=None, help="only accept this API key (401 otherwise)"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Run the stand-in."""
+    settings = parse_args()
+    random.seed(settings.seed)
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(build_app(settings), host=settings.host, port=settings.port)
+
+
+if __name__ == "__main__":
+    main()